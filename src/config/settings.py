@@ -0,0 +1,19 @@
+# src/config/settings.py
+from functools import lru_cache
+import os
+
+
+@lru_cache(maxsize=1)
+def is_wsl() -> bool:
+    """Check if running on Windows Subsystem for Linux (WSL)"""
+    try:
+        with open("/proc/version", "r") as f:
+            return "microsoft" in f.read().lower()
+    except:
+        return False
+
+
+@lru_cache(maxsize=1)
+def is_dev_mode() -> bool:
+    """Development mode saves print jobs to disk instead of printing"""
+    return is_wsl() or os.environ.get("DEV_MODE") == "1"
@@ -1,33 +1,100 @@
 # src/gui/components/order_table.py
-from PySide6.QtWidgets import QTableWidget, QTableWidgetItem, QHeaderView
-from PySide6.QtCore import Qt
-from datetime import datetime
+from dataclasses import fields
+from operator import attrgetter
+from typing import List, Sequence
+from PySide6.QtWidgets import QTableView, QHeaderView
+from PySide6.QtCore import Qt, QAbstractTableModel, QModelIndex
+from models.order import OrderRow
 import logging
-import json
 
 logger = logging.getLogger(__name__)
 
+# Order rows can be selected but never edited
+_NON_EDITABLE_FLAGS = Qt.ItemIsSelectable | Qt.ItemIsEnabled
+
+# One accessor per table column, in OrderRow field order
+_COLUMN_GETTERS = tuple(attrgetter(field.name) for field in fields(OrderRow))
+
+
+class OrderTableModel(QAbstractTableModel):
+    """Table model holding pre-formatted order rows"""
+
+    def __init__(self, columns: Sequence[str], parent=None):
+        super().__init__(parent)
+        self.columns = columns
+        self._rows: List[OrderRow] = []
+
+    def rowCount(self, parent=QModelIndex()) -> int:
+        return 0 if parent.isValid() else len(self._rows)
+
+    def columnCount(self, parent=QModelIndex()) -> int:
+        return 0 if parent.isValid() else len(self.columns)
+
+    def data(self, index, role=Qt.DisplayRole):
+        if role == Qt.DisplayRole and index.isValid():
+            return _COLUMN_GETTERS[index.column()](self._rows[index.row()])
+        return None
+
+    def headerData(self, section, orientation, role=Qt.DisplayRole):
+        if role == Qt.DisplayRole and orientation == Qt.Horizontal:
+            return self.columns[section]
+        return None
+
+    def flags(self, index):
+        """Rows are selectable but never editable"""
+        return _NON_EDITABLE_FLAGS if index.isValid() else Qt.NoItemFlags
+
+    def sort(self, column: int, order=Qt.AscendingOrder) -> None:
+        """Sort rows in place by the given column"""
+        self.layoutAboutToBeChanged.emit()
+        self._sort_rows(self._rows, column, order)
+        self.layoutChanged.emit()
+
+    def set_rows(self, rows: List[OrderRow], sort_column: int = -1, order=None) -> None:
+        """Replace all rows with a single model reset, pre-sorted if requested"""
+        if sort_column >= 0:
+            self._sort_rows(rows, sort_column, order)
+        self.beginResetModel()
+        self._rows = rows
+        self.endResetModel()
+
+    @staticmethod
+    def _sort_rows(rows: List[OrderRow], column: int, order) -> None:
+        rows.sort(key=_COLUMN_GETTERS[column], reverse=order == Qt.DescendingOrder)
+
+    def row_at(self, row: int) -> OrderRow:
+        """Get the order shown in a given row"""
+        return self._rows[row]
+
+
+class OrderTableWidget(QTableView):
+    # Table structure
+    COLUMNS = (
+        "Order #",
+        "Date",
+        "Customer",
+        "Location",
+        "Total",
+        "Status",
+        "ID",  # ID column will be hidden
+    )
+    ORDER_COL = 0
+    DATE_COL = 1
+    CUSTOMER_COL = 2
+    LOCATION_COL = 3
+    TOTAL_COL = 4
+    STATUS_COL = 5
+    ID_COL = 6
 
-class OrderTableWidget(QTableWidget):
     def __init__(self):
         super().__init__()
 
-        # Set up table structure
-        self.columns = [
-            "Order #",
-            "Date",
-            "Customer",
-            "Location",
-            "Total",
-            "Status",
-            "ID",  # ID column will be hidden
-        ]
-        self.setColumnCount(len(self.columns))
-        self.setHorizontalHeaderLabels(self.columns)
+        self._model = OrderTableModel(self.COLUMNS, self)
+        self.setModel(self._model)
 
         # Configure table properties
-        self.setSelectionBehavior(QTableWidget.SelectRows)
-        self.setSelectionMode(QTableWidget.MultiSelection)
+        self.setSelectionBehavior(QTableView.SelectRows)
+        self.setSelectionMode(QTableView.ExtendedSelection)
         self.setAlternatingRowColors(True)
         self.verticalHeader().setVisible(False)
         self.setShowGrid(True)
@@ -35,112 +102,37 @@ class OrderTableWidget(QTableWidget):
         # Configure column properties
         header = self.horizontalHeader()
         header.setSectionResizeMode(QHeaderView.Stretch)
-        header.setSectionResizeMode(0, QHeaderView.ResizeToContents)  # Order #
-        header.setSectionResizeMode(1, QHeaderView.ResizeToContents)  # Date
+        header.setSectionResizeMode(self.ORDER_COL, QHeaderView.ResizeToContents)
+        header.setSectionResizeMode(self.DATE_COL, QHeaderView.ResizeToContents)
 
         # Hide the ID column
-        self.setColumnHidden(self.columns.index("ID"), True)
+        self.setColumnHidden(self.ID_COL, True)
 
         # Enable sorting
         self.setSortingEnabled(True)
 
-    def load_orders(self, orders_data):
-        """Load orders data into the table"""
+    def rowCount(self) -> int:
+        """Number of orders currently loaded"""
+        return self._model.rowCount()
+
+    def load_orders(self, rows: List[OrderRow]):
+        """Load normalized order rows into the table"""
         try:
-            logger.info("Processing orders data structure:")
-            logger.info(json.dumps(orders_data, indent=2))
-
-            self.setSortingEnabled(False)  # Disable sorting while updating
-            self.setRowCount(0)  # Clear existing rows
-
-            if not orders_data or not isinstance(orders_data, dict):
-                logger.error(f"Invalid orders data received: {orders_data}")
-                return
-
-            orders = orders_data.get("data", {}).get("orders", {}).get("edges", [])
-            logger.info(f"Found {len(orders)} orders to process")
-
-            for i, edge in enumerate(orders):
-                logger.info(f"Processing order {i+1}:")
-                logger.info(json.dumps(edge, indent=2))
-
-                node = edge.get("node", {})
-                if not node:
-                    logger.warning(f"Skipping order {i+1} - no node data")
-                    continue
-
-                try:
-                    # Extract data with safe gets and defaults
-                    order_name = node.get("name", "N/A")
-
-                    # Format date
-                    created_at = node.get("createdAt", "")
-                    formatted_date = self._format_date(created_at)
-
-                    # Handle shipping address safely
-                    shipping_address = node.get("shippingAddress", {})
-                    if shipping_address is None:
-                        shipping_address = {}
-
-                    customer_name = shipping_address.get("name", "No Name")
-                    city = shipping_address.get("city", "No City")
-                    province = shipping_address.get("province", "No Province")
-                    location = (
-                        f"{city}, {province}" if city != "No City" else "No Location"
-                    )
-
-                    # Format total price
-                    money = node.get("totalPriceSet", {}).get("shopMoney", {})
-                    currency = money.get("currencyCode", "USD")
-                    amount = money.get("amount", "0.00")
-                    formatted_total = f"{currency} {amount}"
-
-                    # Create table items
-                    items = [
-                        self._create_item(order_name),
-                        self._create_item(formatted_date),
-                        self._create_item(customer_name),
-                        self._create_item(location),
-                        self._create_item(formatted_total),
-                        self._create_item("Unprinted"),
-                        self._create_item(node.get("id", "")),
-                    ]
-
-                    # Add row
-                    row_position = self.rowCount()
-                    self.insertRow(row_position)
-                    for col, item in enumerate(items):
-                        self.setItem(row_position, col, item)
-
-                except Exception as e:
-                    logger.error(f"Error processing order {i+1}: {str(e)}")
-                    logger.error(f"Order data: {json.dumps(node, indent=2)}")
-                    continue
-
-            self.setSortingEnabled(True)  # Re-enable sorting
+            # Swap in all rows at once, already in the order the header shows,
+            # so the view never has to re-sort or repaint in between
+            header = self.horizontalHeader()
+            self.setUpdatesEnabled(False)
+            self._model.set_rows(
+                list(rows), header.sortIndicatorSection(), header.sortIndicatorOrder()
+            )
 
         except Exception as e:
             logger.error(f"Error loading orders into table: {str(e)}")
             raise
-
-    def _format_date(self, date_str: str) -> str:
-        """Format date string safely"""
-        if not date_str:
-            return "No Date"
-        try:
-            date = datetime.fromisoformat(date_str.replace("Z", "+00:00"))
-            return date.strftime("%Y-%m-%d %H:%M")
-        except (ValueError, AttributeError):
-            return "Invalid Date"
-
-    def _create_item(self, text):
-        """Create a non-editable table item"""
-        item = QTableWidgetItem(str(text))
-        item.setFlags(item.flags() & ~Qt.ItemIsEditable)
-        return item
+        finally:
+            self.setUpdatesEnabled(True)
 
     def get_selected_orders(self):
         """Return list of selected order IDs"""
-        selected_rows = self.selectionModel().selectedRows()
-        id_column = self.columns.index("ID")
-        return [self.item(row.row(), id_column).text() for row in selected_rows]
+        rows = sorted({index.row() for index in self.selectionModel().selectedRows()})
+        return [self._model.row_at(row).id for row in rows]
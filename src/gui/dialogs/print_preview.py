@@ -15,9 +15,13 @@ from PySide6.QtCore import Qt, QTimer
 from services.print_service import PrintService
 from models.print_job import PrintJob
 import logging
+import threading
 
 logger = logging.getLogger(__name__)
 
+# Progress updates are repainted at most this often (~60 Hz)
+PROGRESS_INTERVAL_MS = 16
+
 
 class PrintPreviewDialog(QDialog):
     def __init__(self, print_service: PrintService, parent=None):
@@ -32,6 +36,15 @@ class PrintPreviewDialog(QDialog):
         self.pdf_content = None
         self.active_job_id = None
 
+        # Latest callback results from the print thread, applied by a timer
+        # on the GUI thread at most once per frame
+        self._results_lock = threading.Lock()
+        self._latest_progress = None
+        self._completion = None
+        self._progress_timer = QTimer(self)
+        self._progress_timer.setInterval(PROGRESS_INTERVAL_MS)
+        self._progress_timer.timeout.connect(self._flush_progress)
+
         self._setup_ui()
 
     def _setup_ui(self):
@@ -129,6 +142,7 @@ class PrintPreviewDialog(QDialog):
             self.printer_combo.count() == 0
             or self.printer_combo.currentText() == "No printers available"
         ):
+            self.print_service.invalidate_printer_cache()
             self._refresh_printers()
 
     def _start_printing(self):
@@ -158,14 +172,20 @@ class PrintPreviewDialog(QDialog):
             # Disable controls
             self._set_controls_enabled(False)
 
-            # Use QTimer to handle callbacks in main thread
+            # Callbacks run on the print thread; only record the results
+            # and let the GUI thread timer apply them
             def on_progress(current: int, total: int):
-                QTimer.singleShot(0, lambda: self._update_progress(current, total))
+                with self._results_lock:
+                    self._latest_progress = (current, total)
 
             def on_complete(success: bool, error_message: Optional[str]):
-                QTimer.singleShot(
-                    0, lambda: self._print_completed(success, error_message)
-                )
+                with self._results_lock:
+                    self._completion = (success, error_message)
+
+            with self._results_lock:
+                self._latest_progress = None
+                self._completion = None
+            self._progress_timer.start()
 
             # Submit print job
             self.active_job_id = self.print_service.submit_print_job(
@@ -181,9 +201,25 @@ class PrintPreviewDialog(QDialog):
         except Exception as e:
             logger.error(f"Error starting print job: {str(e)}")
             QMessageBox.critical(self, "Error", f"Failed to start print job: {str(e)}")
+            self._progress_timer.stop()
             self._set_controls_enabled(True)
             self.progress_bar.hide()
 
+    def _flush_progress(self):
+        """Apply the most recent progress and completion state"""
+        # Take and clear both results together so a callback landing
+        # mid-flush is never wiped
+        with self._results_lock:
+            progress, self._latest_progress = self._latest_progress, None
+            completion, self._completion = self._completion, None
+
+        if progress:
+            self._update_progress(*progress)
+
+        if completion:
+            self._progress_timer.stop()
+            self._print_completed(*completion)
+
     def _update_progress(self, current: int, total: int):
         """Update progress bar"""
         value = int((current / total) * 100)
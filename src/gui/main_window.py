@@ -1,5 +1,6 @@
 # src/gui/main_window.py
-from typing import List
+from functools import cached_property, partial
+from typing import Any, Dict, List, Optional, Tuple
 from PySide6.QtWidgets import (
     QMainWindow,
     QWidget,
@@ -10,21 +11,25 @@ from PySide6.QtWidgets import (
     QStatusBar,
     QMessageBox,
 )
-from PySide6.QtCore import Qt
+from PySide6.QtCore import Qt, QThreadPool
+from config.settings import is_dev_mode
 from gui.components.order_table import OrderTableWidget
 from gui.dialogs.print_preview import PrintPreviewDialog
+from gui.tasks import FetchOrdersTask, PrintPrepTask
 from services.shopify_client import create_client, ShopifyError
 from services.document_generator import DocumentGenerator
 from services.print_service import create_print_service
+from utils.dicts import dig
 import logging
-import json
 
 logger = logging.getLogger(__name__)
 
 
 class MainWindow(QMainWindow):
-    def __init__(self, dev_mode=True):
+    def __init__(self, dev_mode: Optional[bool] = None):
         super().__init__()
+        if dev_mode is None:
+            dev_mode = is_dev_mode()
         self.dev_mode = dev_mode
         self.setWindowTitle(
             "Shopify Order Print System" + (" (Development Mode)" if dev_mode else "")
@@ -34,7 +39,6 @@ class MainWindow(QMainWindow):
         # Initialize services
         try:
             self.shopify_client = create_client()
-            self.document_generator = DocumentGenerator()
             self.print_service = create_print_service(dev_mode=dev_mode)
         except Exception as e:
             logger.error(f"Failed to initialize services: {str(e)}")
@@ -45,6 +49,13 @@ class MainWindow(QMainWindow):
             )
             raise
 
+        # Order details fetched for printing, keyed by order ID; cleared on
+        # refresh since the server's view of the orders may have changed
+        self._order_cache: Dict[str, Dict[str, Any]] = {}
+        # Bumped on every clear so results fetched before a refresh are not
+        # written back afterwards
+        self._order_cache_generation = 0
+
         # Create central widget and main layout
         central_widget = QWidget()
         self.setCentralWidget(central_widget)
@@ -75,144 +86,190 @@ class MainWindow(QMainWindow):
         # Load initial data
         self.refresh_orders()
 
+    @cached_property
+    def document_generator(self) -> DocumentGenerator:
+        """Pick ticket renderer, built the first time something is printed"""
+        return DocumentGenerator()
+
     def refresh_orders(self):
-        """Fetch and display unprinted orders"""
+        """Fetch unprinted orders in the background"""
         if not self.shopify_client:
             self.status_bar.showMessage("Shopify client not initialized")
             return
 
-        try:
-            self.status_bar.showMessage("Fetching orders...")
-            self.refresh_button.setEnabled(False)
-
-            orders_result = self.shopify_client.get_unprinted_orders()
+        self.status_bar.showMessage("Fetching orders...")
+        self.refresh_button.setEnabled(False)
+        self._order_cache.clear()
+        self._order_cache_generation += 1
 
-            # Debug: Log the raw response
-            logger.info("Raw Shopify response:")
-            logger.info(json.dumps(orders_result, indent=2))
+        task = FetchOrdersTask(self.shopify_client)
+        task.signals.finished.connect(self._on_orders_fetched)
+        task.signals.failed.connect(self._on_orders_fetch_failed)
+        QThreadPool.globalInstance().start(task)
 
-            if not orders_result:
-                self.status_bar.showMessage("No orders received from Shopify")
-                return
-
-            self.order_table.load_orders(orders_result)
+    def _on_orders_fetched(self, order_rows):
+        """Display fetched orders"""
+        try:
+            self.order_table.load_orders(order_rows)
             count = self.order_table.rowCount()
             self.status_bar.showMessage(
                 f"No orders found" if count == 0 else f"Loaded {count} orders"
             )
 
-        except ShopifyError as e:
-            logger.error(f"Shopify API error: {str(e)}")
-            self.status_bar.showMessage("Failed to fetch orders from Shopify")
-            QMessageBox.warning(self, "Shopify Error", str(e))
         except Exception as e:
-            logger.error(f"Error refreshing orders: {str(e)}")
-            self.status_bar.showMessage("Error loading orders")
-            QMessageBox.critical(self, "Error", f"Failed to load orders: {str(e)}")
+            self._on_orders_fetch_failed(e)
         finally:
             self.refresh_button.setEnabled(True)
 
+    def _on_orders_fetch_failed(self, error: Exception):
+        """Report a failed order refresh"""
+        self.refresh_button.setEnabled(True)
+        if isinstance(error, ShopifyError):
+            logger.error(f"Shopify API error: {str(error)}")
+            self.status_bar.showMessage("Failed to fetch orders from Shopify")
+            QMessageBox.warning(self, "Shopify Error", str(error))
+        else:
+            logger.error(f"Error refreshing orders: {str(error)}")
+            self.status_bar.showMessage("Error loading orders")
+            QMessageBox.critical(self, "Error", f"Failed to load orders: {str(error)}")
+
     def print_selected(self):
-        """Print selected orders"""
+        """Prepare selected orders for printing in the background"""
         selected_orders = self.order_table.get_selected_orders()
         if not selected_orders:
             self.status_bar.showMessage("No orders selected")
             return
 
-        try:
-            self.status_bar.showMessage(
-                f"Preparing {len(selected_orders)} orders for printing..."
-            )
-
-            # Get full order details for selected orders
-            order_details = []
-            failed_orders = []
-
-            for order_id in selected_orders:
-                try:
-                    details = self.shopify_client.get_order_details(order_id)
-                    if details and "data" in details and "order" in details["data"]:
-                        order_data = details["data"]["order"]
-                        # Add some safe defaults for missing data
-                        if "fulfillmentOrders" not in order_data:
-                            order_data["fulfillmentOrders"] = {"edges": []}
-                        if "shippingLines" not in order_data:
-                            order_data["shippingLines"] = {"edges": []}
-                        order_details.append(order_data)
-                    else:
-                        failed_orders.append(
-                            f"Order {order_id} - Invalid response format"
-                        )
-                except Exception as e:
-                    failed_orders.append(f"Order {order_id} - {str(e)}")
-
-            if failed_orders:
-                error_msg = "Failed to fetch some orders:\n" + "\n".join(failed_orders)
-                logger.error(error_msg)
-                QMessageBox.warning(self, "Warning", error_msg)
-                if not order_details:  # If no orders were successfully fetched
-                    return
-
-            # Generate PDFs for successful orders
-            pdfs = self.document_generator.generate_batch_pick_tickets(order_details)
-            if not pdfs:
-                raise ValueError("No documents generated")
-
-            # Combine PDFs into a single document
-            combined_pdf = self._combine_pdfs(pdfs)
-
-            # Show print preview dialog
-            dialog = PrintPreviewDialog(self.print_service, self)
-            dialog.set_documents([order["id"] for order in order_details], combined_pdf)
-
-            if dialog.exec():
-                if self.dev_mode:
-                    output_dir = self.print_service.output_dir
-                    QMessageBox.information(
-                        self,
-                        "Development Mode",
-                        f"Print job completed!\n\nPDF has been saved to:\n{output_dir}\n\n"
-                        "Check the output directory for the generated PDF file.",
-                    )
-                self.status_bar.showMessage("Print job submitted successfully")
+        self.status_bar.showMessage(
+            f"Preparing {len(selected_orders)} orders for printing..."
+        )
+        self.print_button.setEnabled(False)
+
+        # The cache is only touched on the GUI thread; the worker gets a
+        # snapshot of the entries it can reuse
+        cache = self._order_cache
+        cached = {
+            order_id: cache[order_id]
+            for order_id in selected_orders
+            if order_id in cache
+        }
+
+        task = PrintPrepTask(self._prepare_print_documents, selected_orders, cached)
+        task.signals.finished.connect(
+            partial(self._on_print_prepared, self._order_cache_generation)
+        )
+        task.signals.failed.connect(self._on_print_prep_failed)
+        QThreadPool.globalInstance().start(task)
+
+    def _prepare_print_documents(
+        self, selected_orders: List[str], cached: Dict[str, Dict[str, Any]]
+    ) -> Tuple[List[str], Optional[bytes], List[str], Dict[str, Dict[str, Any]]]:
+        """
+        Fetch order details and render the combined pick ticket PDF.
+        Runs on a worker thread, so it must not touch any widgets or the
+        order cache.
+
+        Args:
+            selected_orders: Order IDs to print
+            cached: Details fetched for an earlier print, keyed by order ID
+
+        Returns:
+            Tuple of (printed order IDs, combined PDF or None, failure messages,
+            newly fetched details keyed by order ID)
+        """
+        # Reuse details fetched for an earlier print, so re-printing the same
+        # selection does not hit Shopify again
+        details = {order_id: cached.get(order_id) for order_id in selected_orders}
+        fetched = {}
+
+        # Get full order details for the remaining orders in one request
+        missing = [order_id for order_id, data in details.items() if data is None]
+        if missing:
+            response = self.shopify_client.get_orders_details(missing)
+            nodes = dig(response, "data", "nodes", default=[])
+            if len(nodes) != len(missing):
+                raise ShopifyError("Invalid response format")
+
+            for order_id, order_data in zip(missing, nodes):
+                if order_data:
+                    # Add some safe defaults for missing data
+                    if "fulfillmentOrders" not in order_data:
+                        order_data["fulfillmentOrders"] = {"edges": []}
+                    if "shippingLines" not in order_data:
+                        order_data["shippingLines"] = {"edges": []}
+                    details[order_id] = fetched[order_id] = order_data
+
+        order_details = []
+        failed_orders = []
+
+        for order_id in selected_orders:
+            order_data = details.get(order_id)
+            if order_data:
+                order_details.append(order_data)
             else:
-                self.status_bar.showMessage("Print cancelled")
+                failed_orders.append(f"Order {order_id} - Order not found")
 
-        except Exception as e:
-            logger.error(f"Error preparing print job: {str(e)}")
-            self.status_bar.showMessage("Error preparing documents for printing")
-            QMessageBox.critical(
-                self, "Error", f"Failed to prepare documents for printing: {str(e)}"
-            )
+        if not order_details:  # If no orders were successfully fetched
+            return [], None, failed_orders, fetched
 
-    def _combine_pdfs(self, pdf_list: List[bytes]) -> bytes:
-        """Combine multiple PDFs into a single document"""
-        try:
-            from PyPDF2 import PdfReader, PdfWriter
-            import io
+        # Render all successful orders into a single document
+        combined_pdf = self.document_generator.generate_combined_pick_tickets(
+            order_details
+        )
+        order_ids = [order["id"] for order in order_details]
+        return order_ids, combined_pdf, failed_orders, fetched
 
-            writer = PdfWriter()
+    def _on_print_prepared(self, cache_generation: int, result):
+        """Show the print dialog for prepared documents"""
+        self.print_button.setEnabled(True)
+        order_ids, combined_pdf, failed_orders, fetched = result
 
-            # Add each PDF to the writer
-            for pdf_content in pdf_list:
-                reader = PdfReader(io.BytesIO(pdf_content))
-                for page in reader.pages:
-                    writer.add_page(page)
+        # Skip caching details fetched before a refresh cleared the cache
+        if cache_generation == self._order_cache_generation:
+            self._order_cache.update(fetched)
 
-            # Write the combined PDF to bytes
-            output = io.BytesIO()
-            writer.write(output)
-            return output.getvalue()
+        if failed_orders:
+            error_msg = "Failed to fetch some orders:\n" + "\n".join(failed_orders)
+            logger.error(error_msg)
+            QMessageBox.warning(self, "Warning", error_msg)
 
-        except Exception as e:
-            logger.error(f"Error combining PDFs: {str(e)}")
-            raise
+        if not combined_pdf:
+            self.status_bar.showMessage("No orders could be prepared for printing")
+            return
+
+        # Show print preview dialog
+        dialog = PrintPreviewDialog(self.print_service, self)
+        dialog.set_documents(order_ids, combined_pdf)
+
+        if dialog.exec():
+            if self.dev_mode:
+                output_dir = self.print_service.output_dir
+                QMessageBox.information(
+                    self,
+                    "Development Mode",
+                    f"Print job completed!\n\nPDF has been saved to:\n{output_dir}\n\n"
+                    "Check the output directory for the generated PDF file.",
+                )
+            self.status_bar.showMessage("Print job submitted successfully")
+        else:
+            self.status_bar.showMessage("Print cancelled")
+
+    def _on_print_prep_failed(self, error: Exception):
+        """Report a failure while preparing documents"""
+        self.print_button.setEnabled(True)
+        logger.error(f"Error preparing print job: {str(error)}")
+        self.status_bar.showMessage("Error preparing documents for printing")
+        QMessageBox.critical(
+            self, "Error", f"Failed to prepare documents for printing: {str(error)}"
+        )
 
     def closeEvent(self, event):
         """Handle application shutdown"""
         try:
             if hasattr(self, "print_service"):
                 self.print_service.shutdown()
+            if hasattr(self, "shopify_client"):
+                self.shopify_client.close()
         except Exception as e:
             logger.error(f"Error during shutdown: {str(e)}")
         super().closeEvent(event)
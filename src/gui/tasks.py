@@ -0,0 +1,51 @@
+# src/gui/tasks.py
+from typing import Any, Callable, Dict, List
+from PySide6.QtCore import QObject, QRunnable, Signal
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+class TaskSignals(QObject):
+    """Signals used to hand background task results back to the GUI thread"""
+
+    finished = Signal(object)
+    failed = Signal(object)
+
+
+class BackgroundTask(QRunnable):
+    """Run a callable on the Qt thread pool and report the outcome via signals"""
+
+    def __init__(self, fn: Callable[..., Any], *args: Any):
+        super().__init__()
+        self.fn = fn
+        self.args = args
+        self.signals = TaskSignals()
+
+    def run(self):
+        try:
+            result = self.fn(*self.args)
+        except Exception as e:
+            logger.error(f"Background task {type(self).__name__} failed: {str(e)}")
+            self.signals.failed.emit(e)
+        else:
+            self.signals.finished.emit(result)
+
+
+class FetchOrdersTask(BackgroundTask):
+    """Fetch unprinted orders from Shopify"""
+
+    def __init__(self, shopify_client):
+        super().__init__(shopify_client.get_unprinted_order_rows)
+
+
+class PrintPrepTask(BackgroundTask):
+    """Fetch order details and build the combined pick ticket document"""
+
+    def __init__(
+        self,
+        prepare: Callable[[List[str], Dict[str, Any]], Any],
+        order_ids: List[str],
+        cached: Dict[str, Any],
+    ):
+        super().__init__(prepare, order_ids, cached)
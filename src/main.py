@@ -4,18 +4,10 @@ import sys
 import os
 from pathlib import Path
 import logging
+import multiprocessing
 from typing import Optional
 
 
-def is_wsl() -> bool:
-    """Check if running on Windows Subsystem for Linux (WSL)"""
-    try:
-        with open("/proc/version", "r") as f:
-            return "microsoft" in f.read().lower()
-    except:
-        return False
-
-
 def setup_logging():
     """Configure application logging"""
     logging.basicConfig(
@@ -29,13 +21,19 @@ def check_print_output(print_service) -> Optional[dict]:
     """Check the latest print job output if it exists"""
     try:
         output_dir = print_service.get_print_output_dir()
-        jobs = list(output_dir.glob("print_job_*"))
 
-        if not jobs:
+        # Find the newest job in one directory pass, one stat per entry
+        with os.scandir(output_dir) as entries:
+            latest_job = max(
+                (entry for entry in entries if entry.name.startswith("print_job_")),
+                key=lambda entry: entry.stat().st_ctime,
+                default=None,
+            )
+
+        if latest_job is None:
             return None
 
-        latest_job = max(jobs, key=os.path.getctime)
-        metadata_path = latest_job / "metadata.json"
+        metadata_path = Path(latest_job.path) / "metadata.json"
 
         if metadata_path.exists():
             with open(metadata_path) as f:
@@ -64,29 +62,30 @@ def main():
         # Import dependencies after sys.path is set up
         from PySide6.QtWidgets import QApplication
         from PySide6.QtCore import Qt
+        from config.settings import is_dev_mode
         from gui.main_window import MainWindow
         from services.print_service import create_print_service
+        from utils.logger import dumps
 
         # Initialize print service
-        dev_mode = is_wsl() or os.environ.get("DEV_MODE") == "1"
+        dev_mode = is_dev_mode()
         print_service = create_print_service(dev_mode=dev_mode)
         logger.info(
             f"Print service initialized in {'development' if dev_mode else 'production'} mode"
         )
 
-        # In development mode, check latest print job
-        if dev_mode:
+        # In development mode, log the latest print job when debugging
+        if dev_mode and logger.isEnabledFor(logging.DEBUG):
             latest_job = check_print_output(print_service)
             if latest_job:
-                logger.info("Latest print job metadata:")
-                logger.info(json.dumps(latest_job, indent=2))
+                logger.debug("Latest print job metadata:\n%s", dumps(latest_job))
 
         # Create Qt Application
         app = QApplication(sys.argv)
         app.setStyle("Fusion")  # Use Fusion style for consistent cross-platform look
 
         # Create and show main window
-        window = MainWindow()
+        window = MainWindow(dev_mode=dev_mode)
         window.show()
 
         # Start event loop
@@ -98,4 +97,6 @@ def main():
 
 
 if __name__ == "__main__":
+    # Required for process pool workers in frozen Windows builds
+    multiprocessing.freeze_support()
     main()
@@ -0,0 +1,91 @@
+# src/models/order.py
+from dataclasses import dataclass
+from typing import Any, Dict, Iterator, List
+import logging
+
+from utils.dates import format_iso_timestamp
+from utils.dicts import EMPTY, dig
+
+logger = logging.getLogger(__name__)
+
+
+def format_order_date(date_str: str) -> str:
+    """Format an order timestamp for display"""
+    if not date_str:
+        return "No Date"
+    return format_iso_timestamp(date_str) or "Invalid Date"
+
+
+@dataclass(slots=True)
+class OrderRow:
+    """Pre-formatted summary of an unprinted order, one per table row"""
+
+    order_name: str
+    date: str
+    customer: str
+    location: str
+    total: str
+    status: str
+    id: str
+
+    @classmethod
+    def from_node(cls, node: Dict[str, Any]) -> "OrderRow":
+        """Build a row from a GetManyOrders order node"""
+        get = node.get
+
+        # Handle shipping address safely (it may be missing or null)
+        shipping = get("shippingAddress") or EMPTY
+        city = shipping.get("city", "No City")
+        province = shipping.get("province", "No Province")
+
+        # Format total price
+        money = dig(node, "totalPriceSet", "shopMoney") or EMPTY
+        currency = money.get("currencyCode", "USD")
+        amount = money.get("amount", "0.00")
+
+        return cls(
+            order_name=str(get("name", "N/A")),
+            date=format_order_date(get("createdAt", "")),
+            customer=str(shipping.get("name", "No Name")),
+            location=f"{city}, {province}" if city != "No City" else "No Location",
+            total=f"{currency} {amount}",
+            status="Unprinted",
+            id=str(get("id", "")),
+        )
+
+
+def parse_order_rows(orders_data: Dict[str, Any]) -> List[OrderRow]:
+    """
+    Normalize a GetManyOrders response into table rows
+
+    Args:
+        orders_data: Raw GraphQL response from Shopify
+
+    Returns:
+        List of OrderRow; malformed orders are logged and skipped
+    """
+    if not orders_data or not isinstance(orders_data, dict):
+        logger.error(f"Invalid orders data received: {orders_data}")
+        return []
+
+    orders = dig(orders_data, "data", "orders", "edges", default=[])
+    logger.info("Found %d orders to process", len(orders))
+
+    return list(_iter_order_rows(orders))
+
+
+def _iter_order_rows(edges: List[Dict[str, Any]]) -> Iterator[OrderRow]:
+    """Yield a row per valid order edge, logging and skipping bad ones"""
+    from_node = OrderRow.from_node
+
+    for i, edge in enumerate(edges):
+        node = edge.get("node")
+        if not node:
+            logger.warning("Skipping order %d - no node data", i + 1)
+            continue
+
+        try:
+            yield from_node(node)
+        except Exception as e:
+            logger.error("Error processing order %d: %s", i + 1, e)
+            logger.debug("Order data: %s", node)
@@ -2,11 +2,19 @@
 from enum import Enum
 from dataclasses import dataclass, field
 from datetime import datetime
-from typing import Optional, List, Dict, Any
-from uuid import uuid4
-import json
+from typing import Any, BinaryIO, Dict, List, Optional, Union
+from uuid import UUID
+import os
+import time
 from pathlib import Path
 
+import orjson
+
+
+# PDF data a job can carry: any bytes-like buffer, or a binary file object.
+# Other buffer-protocol objects such as array.array or mmap work too
+PdfContent = Union[bytes, bytearray, memoryview, BinaryIO]
+
 
 class PrintJobStatus(Enum):
     PENDING = "pending"
@@ -17,14 +25,23 @@ class PrintJobStatus(Enum):
 
     def is_terminal(self) -> bool:
         """Check if this is a terminal status"""
-        return self in {self.COMPLETED, self.FAILED, self.CANCELLED}
+        return self in PrintJobStatus._TERMINAL
 
     def is_active(self) -> bool:
         """Check if job is actively being processed"""
-        return self in {self.PENDING, self.PROCESSING}
+        return self in PrintJobStatus._ACTIVE
+
 
+# Status groups, built once rather than on every check; members only exist
+# after the class body, so these are attached here
+PrintJobStatus._TERMINAL = frozenset(
+    {PrintJobStatus.COMPLETED, PrintJobStatus.FAILED, PrintJobStatus.CANCELLED}
+)
+PrintJobStatus._ACTIVE = frozenset({PrintJobStatus.PENDING, PrintJobStatus.PROCESSING})
+PrintJobStatus._RETRYABLE = frozenset({PrintJobStatus.FAILED, PrintJobStatus.PENDING})
 
-@dataclass
+
+@dataclass(slots=True)
 class PrintJob:
     """Represents a print job for one or more orders"""
 
@@ -34,12 +51,16 @@ class PrintJob:
     copies: int
     created_at: datetime
     status: PrintJobStatus
-    pdf_content: Optional[bytes] = None
+    pdf_content: Optional[PdfContent] = None
     error_message: Optional[str] = None
     updated_at: datetime = field(default_factory=datetime.now)
     attempts: int = 0
     max_attempts: int = 3
     output_path: Optional[Path] = None
+    # Monotonic clock reading at creation; None for jobs loaded from storage
+    _created_monotonic: Optional[float] = field(
+        default=None, init=False, repr=False, compare=False
+    )
 
     def __post_init__(self):
         """Validate job data after initialization"""
@@ -61,24 +82,59 @@ class PrintJob:
         max_attempts: int = 3,
     ) -> "PrintJob":
         """Create a new print job"""
+        return cls.create_batch([order_ids], printer_name, copies, max_attempts)[0]
+
+    @classmethod
+    def create_batch(
+        cls,
+        order_id_lists: List[List[str]],
+        printer_name: str,
+        copies: int = 1,
+        max_attempts: int = 3,
+    ) -> List["PrintJob"]:
+        """
+        Create one new print job per list of order IDs
+
+        Random bytes for all job IDs are read in a single os.urandom call
+        rather than once per job, and the jobs share one creation time.
+        """
         now = datetime.now()
-        return cls(
-            id=str(uuid4()),
-            order_ids=order_ids,
-            printer_name=printer_name,
-            copies=copies,
-            created_at=now,
-            updated_at=now,
-            status=PrintJobStatus.PENDING,
-            max_attempts=max_attempts,
-        )
+        created_monotonic = time.monotonic()
+        rnd = os.urandom(16 * len(order_id_lists))
+
+        jobs = []
+        for i, order_ids in enumerate(order_id_lists):
+            job = cls(
+                id=str(UUID(bytes=rnd[i * 16 : (i + 1) * 16], version=4)),
+                order_ids=order_ids,
+                printer_name=printer_name,
+                copies=copies,
+                created_at=now,
+                updated_at=now,
+                status=PrintJobStatus.PENDING,
+                max_attempts=max_attempts,
+            )
+            job._created_monotonic = created_monotonic
+            jobs.append(job)
+        return jobs
 
     def update_status(
-        self, status: PrintJobStatus, error: Optional[str] = None
+        self,
+        status: PrintJobStatus,
+        error: Optional[str] = None,
+        now: Optional[datetime] = None,
     ) -> None:
-        """Update job status and related fields"""
+        """
+        Update job status and related fields
+
+        Args:
+            status: New job status
+            error: Error message to record, if any
+            now: Update timestamp; callers updating many jobs at once can
+                pass one shared value instead of reading the clock per job
+        """
         self.status = status
-        self.updated_at = datetime.now()
+        self.updated_at = now or datetime.now()
 
         if error:
             self.error_message = error
@@ -89,7 +145,7 @@ class PrintJob:
     def can_retry(self) -> bool:
         """Check if job can be retried"""
         return (
-            self.status in {PrintJobStatus.FAILED, PrintJobStatus.PENDING}
+            self.status in PrintJobStatus._RETRYABLE
             and self.attempts < self.max_attempts
         )
 
@@ -135,14 +191,14 @@ class PrintJob:
 
     def to_json_file(self, path: Path) -> None:
         """Save job metadata to JSON file"""
-        with open(path, "w") as f:
-            json.dump(self.to_dict(), f, indent=2)
+        with open(path, "wb") as f:
+            f.write(orjson.dumps(self.to_dict(), option=orjson.OPT_INDENT_2))
 
     @classmethod
     def from_json_file(cls, path: Path) -> "PrintJob":
         """Load job metadata from JSON file"""
-        with open(path) as f:
-            return cls.from_dict(json.load(f))
+        with open(path, "rb") as f:
+            return cls.from_dict(orjson.loads(f.read()))
 
     def __str__(self) -> str:
         """Human readable string representation"""
@@ -160,4 +216,6 @@ class PrintJob:
 
     def age(self) -> float:
         """Get job age in seconds"""
+        if self._created_monotonic is not None:
+            return time.monotonic() - self._created_monotonic
         return (datetime.now() - self.created_at).total_seconds()
@@ -1,69 +1,225 @@
-import json
 import tempfile
 import shutil
 import hashlib
 from urllib.parse import urlparse
 import requests
-from datetime import datetime
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 from pathlib import Path
 import logging
 import os
+import re
+import threading
 import base64
-from typing import Dict, Any, List, Optional
-from jinja2 import Environment, FileSystemLoader
-from weasyprint import HTML, CSS
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from functools import cached_property
+from operator import itemgetter
+from typing import Dict, Any, List, Mapping, Optional, Tuple
+from jinja2 import Environment, FileSystemBytecodeCache, FileSystemLoader
+from PIL import Image
+from utils.dates import format_iso_timestamp
+from utils.dicts import EMPTY
+from utils.logger import dumps
+
 
 logger = logging.getLogger(__name__)
 
+TEMPLATE_DIR = Path(__file__).parent.parent / "templates"
+
+# Order fields a pick ticket cannot be rendered without
+_REQUIRED_ORDER_FIELDS = ("name", "shippingAddress", "lineItems")
+
+# Sort key for inventory locations
+_NAME_GETTER = itemgetter("name")
+
+# Maximum concurrent product image downloads per order
+IMAGE_DOWNLOAD_WORKERS = 8
+
+# The image cache persists across runs; trim it once it grows past this size
+IMAGE_CACHE_MAX_BYTES = 500 * 1024 * 1024
+
+# Product images render in a 150x150 box; thumbnails keep 2x for print sharpness
+THUMBNAIL_SIZE = (300, 300)
+JPEG_QUALITY = 80
+
+# write_pdf options: compressed streams and object streams, recompressed images
+_PDF_OPTIONS = {
+    "uncompressed_pdf": False,
+    "optimize_images": True,
+    "jpeg_quality": JPEG_QUALITY,
+}
+
+# Shown in place of product images that are missing or fail to download
+_PLACEHOLDER_SVG = """<?xml version="1.0" encoding="UTF-8"?>
+<svg width="150" height="150" version="1.1" viewBox="0 0 150 150" xmlns="http://www.w3.org/2000/svg">
+    <rect width="150" height="150" fill="#f0f0f0"/>
+    <text x="75" y="75" font-family="Arial" font-size="14"
+          text-anchor="middle" dominant-baseline="middle" fill="#666">
+        No Image
+    </text>
+</svg>"""
+_PLACEHOLDER_DATA_URI = (
+    "data:image/svg+xml;base64," + base64.b64encode(_PLACEHOLDER_SVG.encode()).decode()
+)
+
+
+def _inventory_location(level: Dict[str, Any]) -> Dict[str, Any]:
+    """Name and available quantity for one inventory level edge"""
+    node = level.get("node") or EMPTY
+    try:
+        name = node["location"]["name"]
+    except (KeyError, TypeError):
+        name = "Unknown"
+
+    available = 0
+    for q in node.get("quantities") or ():
+        if q.get("name") == "available":
+            available = q.get("quantity", 0)
+            break
+
+    return {"name": name, "quantity": available}
+
+
+def _tmp_path_for(path: Path) -> Path:
+    """Temp file beside path, unique to this process and thread"""
+    return path.with_name(f"{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+
 
 class DocumentGenerator:
-    def __init__(self):
-        """Initialize the document generator with templates"""
+    def __init__(self, bytecode_cache_dir: Optional[Path] = None):
+        """
+        Initialize the document generator with templates
+
+        Args:
+            bytecode_cache_dir: Where compiled templates are kept; defaults to
+                Jinja's private per-user cache directory
+        """
         # Get the absolute path to the templates directory
-        self.template_dir = Path(__file__).parent.parent / "templates"
+        self.template_dir = TEMPLATE_DIR
 
         # Create a temp directory for image caching
         self.image_cache_dir = Path(tempfile.gettempdir()) / "shopify_print_images"
         self.image_cache_dir.mkdir(parents=True, exist_ok=True)
+        self._evict_image_cache()
+        self._path_cache: Dict[str, str] = {}  # Image URL -> cached file URI
+
+        # Pooled keep-alive connections for image downloads, so concurrent
+        # fetches from the same CDN reuse connections instead of handshaking
+        self.http = requests.Session()
+        self.http.mount(
+            "https://",
+            HTTPAdapter(
+                pool_connections=16,
+                pool_maxsize=32,
+                max_retries=Retry(total=2, backoff_factor=0.2),
+            ),
+        )
+
+        # Keep compiled templates on disk so new processes, including batch
+        # render workers, skip compilation; entries are keyed on the source.
+        # Cached bytecode is executed on load, so the default must be Jinja's
+        # own directory (per-user, mode 0700, owner-checked), never a shared
+        # path another local user could pre-create
+        if bytecode_cache_dir is None:
+            bytecode_cache = FileSystemBytecodeCache()
+        else:
+            Path(bytecode_cache_dir).mkdir(parents=True, exist_ok=True)
+            bytecode_cache = FileSystemBytecodeCache(str(bytecode_cache_dir))
+        self.bytecode_cache_dir = Path(bytecode_cache.directory)
 
         # Initialize Jinja2 environment with the templates directory
         self.env = Environment(
-            loader=FileSystemLoader(str(self.template_dir)), autoescape=True
+            loader=FileSystemLoader(str(self.template_dir)),
+            autoescape=True,
+            auto_reload=False,  # Templates ship with the app and never change
+            cache_size=-1,  # Never evict loaded templates, including includes
+            bytecode_cache=bytecode_cache,
         )
 
         # Add custom filters
         self.env.filters["date"] = self._format_date
         self.env.filters["cached_image_path"] = self._get_cached_image_path
 
-        # Get absolute paths for CSS files
-        css_dir = self.template_dir / "styles"
-        self.base_css = CSS(filename=str(css_dir / "base.css"))
-        self.print_css = CSS(filename=str(css_dir / "print.css"))
+        # Compile the pick ticket templates once up front
+        self._pick_ticket_template = self.env.get_template("pick_ticket.html")
+        self._pick_tickets_template = self.env.get_template("pick_tickets.html")
+
+    # WeasyPrint pulls in Pango, cairo and a fontconfig scan on import, so it
+    # is only loaded once a document is actually rendered. Parsed stylesheets
+    # are immutable, so one pair is shared by every generator in the process.
+    _shared_css: Optional[Tuple[Any, Any]] = None
+    _shared_css_lock = threading.Lock()
+
+    @classmethod
+    def _get_shared_css(cls) -> Tuple[Any, Any]:
+        """Base and print stylesheets, parsed once per process"""
+        if cls._shared_css is None:
+            with cls._shared_css_lock:
+                if cls._shared_css is None:
+                    from weasyprint import CSS
+
+                    css_dir = TEMPLATE_DIR / "styles"
+                    cls._shared_css = (
+                        CSS(filename=str(css_dir / "base.css")),
+                        CSS(filename=str(css_dir / "print.css")),
+                    )
+        return cls._shared_css
+
+    @property
+    def base_css(self):
+        """Base stylesheet, parsed on first render"""
+        return self._get_shared_css()[0]
+
+    @property
+    def print_css(self):
+        """Print stylesheet, parsed on first render"""
+        return self._get_shared_css()[1]
+
+    @cached_property
+    def _stylesheets(self):
+        """Stylesheets passed to every render"""
+        return list(self._get_shared_css())
 
     def _format_date(self, value):
         """Format ISO date string to human-readable format"""
         if not value:
             return ""
-        try:
-            dt = datetime.fromisoformat(value.replace("Z", "+00:00"))
-            return dt.strftime("%Y-%m-%d %H:%M")
-        except Exception as e:
-            logger.error(f"Error formatting date {value}: {str(e)}")
+        formatted = format_iso_timestamp(value)
+        if formatted is None:
+            logger.error("Error formatting date %s", value)
             return value
+        return formatted
 
     def _get_placeholder_data_uri(self) -> str:
-        """Generate a simple SVG placeholder as a data URI"""
-        svg = """<?xml version="1.0" encoding="UTF-8"?>
-        <svg width="150" height="150" version="1.1" viewBox="0 0 150 150" xmlns="http://www.w3.org/2000/svg">
-            <rect width="150" height="150" fill="#f0f0f0"/>
-            <text x="75" y="75" font-family="Arial" font-size="14" 
-                  text-anchor="middle" dominant-baseline="middle" fill="#666">
-                No Image
-            </text>
-        </svg>"""
-
-        encoded = base64.b64encode(svg.encode()).decode()
-        return f"data:image/svg+xml;base64,{encoded}"
+        """Get the SVG placeholder image as a data URI"""
+        return _PLACEHOLDER_DATA_URI
+
+    def _evict_image_cache(self) -> None:
+        """Delete least recently used cached images beyond the size limit"""
+        try:
+            entries = []
+            with os.scandir(self.image_cache_dir) as it:
+                for entry in it:
+                    if entry.is_file():
+                        st = entry.stat()
+                        last_used = max(st.st_atime, st.st_mtime)
+                        entries.append((last_used, st.st_size, entry.path))
+
+            total = sum(size for _, size, _ in entries)
+            if total <= IMAGE_CACHE_MAX_BYTES:
+                return
+
+            entries.sort()  # Oldest use first
+            for _, size, path in entries:
+                Path(path).unlink(missing_ok=True)
+                total -= size
+                if total <= IMAGE_CACHE_MAX_BYTES:
+                    break
+
+            logger.info("Trimmed image cache to %s bytes", total)
+
+        except Exception as e:
+            logger.error("Failed to trim image cache: %s", e)
 
     def _download_image(self, url: str) -> Optional[Path]:
         """
@@ -77,30 +233,108 @@ class DocumentGenerator:
         """
         try:
             # Create a unique filename based on the URL
-            url_hash = hashlib.md5(url.encode()).hexdigest()
+            url_hash = hashlib.blake2b(url.encode(), digest_size=16).hexdigest()
             parsed_url = urlparse(url)
             extension = Path(parsed_url.path).suffix or ".jpg"
             cached_path = self.image_cache_dir / f"{url_hash}{extension}"
+            thumb_path = self.image_cache_dir / f"{url_hash}_thumb.jpg"
 
             # If already cached, return path
-            if cached_path.exists():
-                return cached_path
+            if thumb_path.exists():
+                return thumb_path
 
-            # Download the image
-            response = requests.get(url, stream=True, timeout=5)
-            response.raise_for_status()
+            if not cached_path.exists():
+                # Download the image
+                response = self.http.get(url, stream=True, timeout=5)
+                response.raise_for_status()
 
-            # Save to cache
-            with open(cached_path, "wb") as f:
-                shutil.copyfileobj(response.raw, f)
+                # Save to cache via a private temp file, so an interrupted
+                # download never sits at the cached name to be reused later
+                tmp_path = _tmp_path_for(cached_path)
+                try:
+                    with open(tmp_path, "wb") as f:
+                        shutil.copyfileobj(response.raw, f)
+                    os.replace(tmp_path, cached_path)
+                except BaseException:
+                    tmp_path.unlink(missing_ok=True)
+                    raise
+
+                logger.info(
+                    "Downloaded and cached image from %s to %s", url, cached_path
+                )
 
-            logger.info(f"Downloaded and cached image from {url} to {cached_path}")
-            return cached_path
+            return self._make_thumbnail(cached_path, thumb_path)
 
         except Exception as e:
-            logger.error(f"Failed to download image from {url}: {str(e)}")
+            logger.error("Failed to download image from %s: %s", url, e)
             return None
 
+    def _make_thumbnail(self, source: Path, thumb_path: Path) -> Path:
+        """
+        Downscale a cached image to a JPEG thumbnail
+
+        Args:
+            source: Original downloaded image
+            thumb_path: Where to write the thumbnail
+
+        Returns:
+            Path to the thumbnail, or the original if Pillow cannot read it
+        """
+        try:
+            with Image.open(source) as img:
+                img.thumbnail(THUMBNAIL_SIZE, Image.LANCZOS)
+                if img.mode not in ("RGB", "L"):
+                    # JPEG has no alpha channel; flatten onto the white page
+                    rgba = img.convert("RGBA")
+                    img = Image.new("RGB", rgba.size, "white")
+                    img.paste(rgba, mask=rgba.getchannel("A"))
+
+                # Write then rename so a concurrent reader never sees half a file
+                tmp_path = _tmp_path_for(thumb_path)
+                try:
+                    img.save(tmp_path, "JPEG", quality=JPEG_QUALITY, optimize=True)
+                    os.replace(tmp_path, thumb_path)
+                except BaseException:
+                    tmp_path.unlink(missing_ok=True)
+                    raise
+            return thumb_path
+
+        except Exception as e:  # e.g. SVG, which WeasyPrint renders natively
+            logger.debug("Keeping original image %s: %s", source, e)
+            return source
+
+    def _resolve_images(self, line_items: List[Dict[str, Any]]) -> None:
+        """
+        Set each line item's image_src to a local file or data URI
+
+        Uncached images are downloaded concurrently first, so building the
+        template data does all image work and rendering never waits on it.
+        """
+        path_cache = self._path_cache
+        urls = {
+            url
+            for item in line_items
+            if (url := item["image_url"])
+            and url.startswith(("http://", "https://"))
+            and url not in path_cache
+        }
+        failed = set()
+        if len(urls) > 1:
+            workers = min(len(urls), IMAGE_DOWNLOAD_WORKERS)
+            with ThreadPoolExecutor(max_workers=workers) as executor:
+                # _download_image returns None instead of raising on failure
+                for url, path in zip(urls, executor.map(self._download_image, urls)):
+                    if path is None:
+                        failed.add(url)
+                    else:
+                        path_cache[url] = path.as_uri()
+
+        resolve = self._get_cached_image_path
+        for item in line_items:
+            url = item["image_url"]
+            # Don't retry a download that just failed
+            item["image_src"] = _PLACEHOLDER_DATA_URI if url in failed else resolve(url)
+
     def _get_cached_image_path(self, url: str) -> str:
         """
         Jinja2 filter to get path to cached image
@@ -109,7 +343,7 @@ class DocumentGenerator:
             url: Original image URL
 
         Returns:
-            Path to cached image or data URI for placeholder
+            file:// URI of the cached image or data URI for placeholder
         """
         if not url:
             return self._get_placeholder_data_uri()
@@ -117,38 +351,36 @@ class DocumentGenerator:
         if url.startswith("/api/placeholder"):
             return self._get_placeholder_data_uri()
 
+        if url.startswith("data:"):
+            return url  # Already inline
+
+        # Products repeat across orders, so remember where each image landed
+        if uri := self._path_cache.get(url):
+            return uri
+
         cached_path = self._download_image(url)
         if cached_path:
-            return str(cached_path)
+            # An explicit file:// URI does not depend on base_url resolution
+            uri = self._path_cache[url] = cached_path.as_uri()
+            return uri
         return self._get_placeholder_data_uri()
 
     def _get_inventory_locations(self, variant: Dict[str, Any]) -> List[Dict[str, Any]]:
         """Extract inventory locations and quantities from variant data"""
         try:
-            inventory_levels = (
-                variant.get("inventoryItem", {})
-                .get("inventoryLevels", {})
-                .get("edges", [])
-            )
-
-            locations = []
-            for level in inventory_levels:
-                node = level.get("node", {})
-                location_name = node.get("location", {}).get("name", "Unknown")
-
-                # Get available quantity
-                quantities = node.get("quantities", [])
-                available = 0
-                for q in quantities:
-                    if q.get("name") == "available":
-                        available = q.get("quantity", 0)
-                        break
+            try:
+                inventory_levels = variant["inventoryItem"]["inventoryLevels"]["edges"]
+            except (KeyError, TypeError):
+                inventory_levels = []
 
-                if location_name:
-                    locations.append({"name": location_name, "quantity": available})
+            locations = [
+                location
+                for location in map(_inventory_location, inventory_levels)
+                if location["name"]
+            ]
 
             # Sort locations by name for consistent display
-            locations.sort(key=lambda x: x["name"])
+            locations.sort(key=_NAME_GETTER)
             return (
                 locations
                 if locations
@@ -156,97 +388,130 @@ class DocumentGenerator:
             )
 
         except Exception as e:
-            logger.error(f"Error getting inventory locations: {str(e)}")
+            logger.error("Error getting inventory locations: %s", e)
             return [{"name": "Default Location", "quantity": 0}]
 
     def _get_shipping_method(self, order_data: Dict[str, Any]) -> str:
         """Extract shipping method with multiple fallbacks"""
         try:
             # Try shipping lines first (more reliable)
-            shipping_lines = order_data.get("shippingLines", {}).get("edges", [])
-            if shipping_lines and len(shipping_lines) > 0:
-                first_line = shipping_lines[0].get("node", {})
-                if title := first_line.get("title"):
-                    return title
-                if code := first_line.get("code"):
-                    return code
+            try:
+                first_line = order_data["shippingLines"]["edges"][0]["node"]
+            except (KeyError, IndexError, TypeError):
+                return "Standard Shipping"
 
-            return "Standard Shipping"
+            get = first_line.get
+            return get("title") or get("code") or "Standard Shipping"
 
         except Exception as e:
-            logger.error(f"Error getting shipping method: {str(e)}")
+            logger.error("Error getting shipping method: %s", e)
             return "Standard Shipping"
 
     def _process_line_items(self, order_data: Dict[str, Any]) -> List[Dict[str, Any]]:
         """Process line items from order data"""
         processed_items = []
         try:
-            line_items = order_data.get("lineItems", {}).get("edges", [])
-            logger.info(f"Found {len(line_items)} raw line items")
+            try:
+                line_items = order_data["lineItems"]["edges"]
+            except (KeyError, TypeError):
+                line_items = []
+            logger.info("Found %d raw line items", len(line_items))
 
+            get_locations = self._get_inventory_locations
+            append = processed_items.append
             for edge in line_items:
                 try:
-                    node = edge.get("node", {})
-                    variant = node.get("variant", {}) or {}
-                    product = node.get("product", {}) or {}
-
-                    # Get image URL with better fallback handling
-                    image_url = None
-                    if variant and variant.get("image", {}).get("url"):
-                        image_url = variant["image"]["url"]
-                    elif product.get("featuredImage", {}).get("url"):
-                        image_url = product["featuredImage"]["url"]
-
-                    if not image_url:
-                        image_url = "/api/placeholder/150/150"
-
-                    # Get inventory locations with quantities
-                    locations = self._get_inventory_locations(variant)
+                    node = edge.get("node") or EMPTY
+                    get = node.get
+                    variant = get("variant") or EMPTY
+                    product = get("product") or EMPTY
+
+                    # Variant image, then product image, then the placeholder
+                    image_url = (
+                        (variant.get("image") or EMPTY).get("url")
+                        or (product.get("featuredImage") or EMPTY).get("url")
+                        or _PLACEHOLDER_DATA_URI
+                    )
 
                     item = {
-                        "sku": node.get("sku", "No SKU"),
-                        "quantity": node.get("quantity", 0),
+                        "sku": get("sku", "No SKU"),
+                        "quantity": get("quantity", 0),
                         "title": product.get("title", "Unknown Product"),
                         "variant_title": variant.get("title", ""),
-                        "vendor": node.get("vendor", "No Vendor"),
-                        "locations": locations,
+                        "vendor": get("vendor", "No Vendor"),
+                        # Inventory locations with quantities
+                        "locations": get_locations(variant),
                         "image_url": image_url,
                     }
 
-                    processed_items.append(item)
+                    append(item)
 
                 except Exception as e:
-                    logger.error(f"Error processing line item: {str(e)}")
+                    logger.error("Error processing line item: %s", e)
                     continue
 
             return processed_items
 
         except Exception as e:
-            logger.error(f"Error processing line items: {str(e)}")
+            logger.error("Error processing line items: %s", e)
             return []
 
+    def _validate_order_payload(self, order_data: Dict[str, Any]) -> None:
+        """
+        Check an order payload has the fields a pick ticket needs
+
+        Runs before any template or WeasyPrint work so bad input fails fast.
+        Fields only have to be present; a null shippingAddress (e.g. local
+        pickup) is still rendered with placeholders.
+
+        Raises:
+            ValueError: If the payload is not an order or lacks required fields
+        """
+        if not isinstance(order_data, Mapping):
+            raise ValueError("Invalid order data structure")
+
+        # Handle both direct and nested data structures
+        order_node = (
+            (order_data["data"] or EMPTY).get("order")
+            if "data" in order_data
+            else order_data
+        )
+        if not isinstance(order_node, Mapping) or not order_node:
+            raise ValueError("Invalid order data structure")
+
+        missing = [field for field in _REQUIRED_ORDER_FIELDS if field not in order_node]
+        if missing:
+            raise ValueError(
+                f"Order data missing required fields: {', '.join(missing)}"
+            )
+
     def _process_order_data(self, order_data: Dict[str, Any]) -> Dict[str, Any]:
         """Process raw order data into template-friendly format"""
         try:
             logger.info("Processing order data...")
-            logger.info(f"Raw order data structure: {json.dumps(order_data, indent=2)}")
+
+            # Full payload dumps are large, so only build them when debugging
+            debug = logger.isEnabledFor(logging.DEBUG)
+            if debug:
+                logger.debug("Raw order data structure: %s", dumps(order_data))
 
             # Handle both direct and nested data structures
             order_node = (
-                order_data.get("data", {}).get("order", {})  # Nested structure
+                order_data.get("data", EMPTY).get("order", EMPTY)  # Nested structure
                 if "data" in order_data
                 else order_data  # Direct structure
             )
 
-            logger.info(f"Order node: {json.dumps(order_node, indent=2)}")
+            if debug:
+                logger.debug("Order node: %s", dumps(order_node))
 
             if not order_node:
                 raise ValueError("Invalid order data structure")
 
             # Extract shipping address
-            shipping = order_node.get("shippingAddress") or {}
+            shipping = order_node.get("shippingAddress") or EMPTY
             if not isinstance(shipping, dict):
-                shipping = {}
+                shipping = EMPTY
 
             shipping_address = {
                 "name": (
@@ -266,12 +531,14 @@ class DocumentGenerator:
             # Process line items
             line_items = self._process_line_items(order_node)
 
+            # Resolve product images to local files before rendering
+            self._resolve_images(line_items)
+
             # Get total
-            total_price = (
-                order_node.get("totalPriceSet", {})
-                .get("shopMoney", {})
-                .get("amount", "0.00")
-            )
+            try:
+                total_price = order_node["totalPriceSet"]["shopMoney"]["amount"]
+            except (KeyError, TypeError):
+                total_price = "0.00"
 
             # Compile template data
             template_data = {
@@ -286,85 +553,186 @@ class DocumentGenerator:
                 }
             }
 
-            logger.info(f"Final template data: {json.dumps(template_data, indent=2)}")
+            if debug:
+                logger.debug("Final template data: %s", dumps(template_data))
             return template_data
 
         except Exception as e:
-            logger.error(f"Error processing order data: {str(e)}")
-            logger.error(f"Order data: {json.dumps(order_data, indent=2)}")
+            logger.error("Error processing order data: %s", e)
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug("Order data: %s", dumps(order_data))
             raise
 
-    def generate_pick_ticket(self, order_data: Dict[str, Any]) -> bytes:
+    def generate_pick_ticket(
+        self, order_data: Dict[str, Any], target: Optional[Path] = None
+    ) -> Optional[bytes]:
         """
         Generate a PDF pick ticket for an order
 
         Args:
             order_data: Order data from Shopify API
+            target: File to stream the PDF to instead of returning it
 
         Returns:
-            bytes: Generated PDF content
+            bytes: Generated PDF content, or None if written to target
 
         Raises:
             Exception: If PDF generation fails
         """
         try:
+            self._validate_order_payload(order_data)
+
             # Process order data for template
             template_data = self._process_order_data(order_data)
 
-            # Get template
-            template = self.env.get_template("pick_ticket.html")
-
             # Render HTML
-            html_content = template.render(**template_data)
+            html_content = self._pick_ticket_template.render(**template_data)
 
-            # Create temporary file for HTML
-            with tempfile.NamedTemporaryFile(
-                mode="w", suffix=".html", delete=False
-            ) as temp_html:
-                temp_html.write(html_content)
-                temp_html_path = temp_html.name
+            from weasyprint import HTML
 
-            try:
-                # Generate PDF with base URL for asset resolution
-                html = HTML(filename=temp_html_path, base_url=str(self.template_dir))
-                pdf_content = html.write_pdf(
-                    stylesheets=[self.base_css, self.print_css]
-                )
-                return pdf_content
-
-            finally:
-                # Clean up temporary file
-                os.unlink(temp_html_path)
+            # Generate PDF straight from memory; base_url resolves relative assets
+            html = HTML(string=html_content, base_url=str(self.template_dir))
+            return html.write_pdf(
+                target=str(target) if target else None,
+                stylesheets=self._stylesheets,
+                **_PDF_OPTIONS,
+            )
 
         except Exception as e:
-            logger.error(f"Failed to generate pick ticket: {str(e)}")
+            logger.error("Failed to generate pick ticket: %s", e)
             raise
 
+    def generate_combined_pick_tickets(
+        self, orders_data: List[Dict[str, Any]]
+    ) -> bytes:
+        """
+        Generate one PDF containing the pick tickets for multiple orders
+
+        All orders are rendered into one HTML document with a page break
+        between them and laid out in a single WeasyPrint pass, so there is no
+        per-order PDF to parse and merge.
+
+        Args:
+            orders_data: List of order data from Shopify API
+
+        Returns:
+            bytes: Combined PDF content, orders in the given order
+
+        Raises:
+            Exception: If any order cannot be processed
+        """
+        orders = []
+        errors = []
+
+        for order_data in orders_data:
+            try:
+                self._validate_order_payload(order_data)
+                orders.append(self._process_order_data(order_data)["order"])
+            except Exception as e:
+                order_number = _order_name(order_data) or "Unknown"
+                errors.append(f"Order {order_number}: {str(e)}")
+
+        if errors:
+            error_msg = "\n".join(errors)
+            raise Exception(f"Errors generating pick tickets:\n{error_msg}")
+
+        if not orders:
+            raise ValueError("No orders to render")
+
+        from weasyprint import HTML
+
+        html_content = self._pick_tickets_template.render(orders=orders)
+        html = HTML(string=html_content, base_url=str(self.template_dir))
+        return html.write_pdf(stylesheets=self._stylesheets, **_PDF_OPTIONS)
+
     def generate_batch_pick_tickets(
         self, orders_data: List[Dict[str, Any]]
     ) -> List[bytes]:
         """
         Generate PDF pick tickets for multiple orders
 
+        Orders are rendered in parallel worker processes, since WeasyPrint
+        layout is CPU-bound and runs one order at a time per interpreter.
+
         Args:
             orders_data: List of order data from Shopify API
 
         Returns:
-            List[bytes]: List of generated PDF contents
+            List[bytes]: List of generated PDF contents, in the given order
 
         Raises:
             Exception: If batch generation fails
         """
+        results = self._map_pick_tickets(orders_data, [None] * len(orders_data))
+        return self._collect_batch_results(orders_data, results)
+
+    def generate_batch_pick_tickets_to_dir(
+        self, orders_data: List[Dict[str, Any]], out_dir: Path
+    ) -> List[Path]:
+        """
+        Generate PDF pick tickets for multiple orders as files
+
+        Each worker streams its PDF straight to disk, so no more than one
+        ticket per worker is held in memory regardless of batch size.
+
+        Args:
+            orders_data: List of order data from Shopify API
+            out_dir: Directory to write the PDFs to; created if missing
+
+        Returns:
+            List[Path]: Paths of the generated PDFs, in the given order
+
+        Raises:
+            Exception: If batch generation fails
+        """
+        out_dir.mkdir(parents=True, exist_ok=True)
+        paths = [
+            out_dir / f"{i:04d}_{_pdf_stem(order_data)}.pdf"
+            for i, order_data in enumerate(orders_data, 1)
+        ]
+        results = self._map_pick_tickets(orders_data, paths)
+        self._collect_batch_results(orders_data, results)
+        return paths
+
+    def _map_pick_tickets(
+        self, orders_data: List[Dict[str, Any]], targets: List[Optional[Path]]
+    ) -> List[Tuple[Optional[bytes], Optional[str]]]:
+        """Render pick tickets in parallel worker processes, in order"""
+        if not orders_data:
+            return []
+
+        workers = min(len(orders_data), os.cpu_count() or 1)
+        if workers == 1:
+            # Nothing to parallelize, so skip the process start-up cost
+            return [
+                _pick_ticket_result(self, order, target)
+                for order, target in zip(orders_data, targets)
+            ]
+
+        # A few chunks per worker keeps IPC low while still balancing load
+        chunksize = max(1, len(orders_data) // (4 * workers))
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            return list(
+                executor.map(
+                    render_pick_ticket, orders_data, targets, chunksize=chunksize
+                )
+            )
+
+    @staticmethod
+    def _collect_batch_results(
+        orders_data: List[Dict[str, Any]],
+        results: List[Tuple[Optional[bytes], Optional[str]]],
+    ) -> List[Optional[bytes]]:
+        """Return the rendered PDFs, or raise one error for all failed orders"""
         pdfs = []
         errors = []
 
-        for order_data in orders_data:
-            try:
-                pdf = self.generate_pick_ticket(order_data)
+        for order_data, (pdf, error) in zip(orders_data, results):
+            if error is None:
                 pdfs.append(pdf)
-            except Exception as e:
-                order_number = order_data.get("name", "Unknown")
-                errors.append(f"Order {order_number}: {str(e)}")
+            else:
+                order_number = _order_name(order_data) or "Unknown"
+                errors.append(f"Order {order_number}: {error}")
 
         if errors:
             error_msg = "\n".join(errors)
@@ -372,10 +740,57 @@ class DocumentGenerator:
 
         return pdfs
 
-    def __del__(self):
-        """Cleanup temporary files on deletion"""
+
+def _order_name(order_data: Any) -> Optional[str]:
+    """Order name for messages, or None if the payload is not a mapping"""
+    return order_data.get("name") if isinstance(order_data, Mapping) else None
+
+
+def _pdf_stem(order_data: Dict[str, Any]) -> str:
+    """Filesystem-safe file name for an order's PDF, e.g. #1001 -> 1001"""
+    name = str(_order_name(order_data) or "order").lstrip("#")
+    return re.sub(r"[^\w.-]", "_", name) or "order"
+
+
+# Generator owned by the current worker process, built on first use
+_worker_generator: Optional[DocumentGenerator] = None
+
+
+def render_pick_ticket(
+    order_data: Dict[str, Any], target: Optional[Path] = None
+) -> Tuple[Optional[bytes], Optional[str]]:
+    """
+    Render a single pick ticket in a worker process
+
+    DocumentGenerator holds Jinja2 and WeasyPrint objects that cannot be
+    pickled, so each process builds its own generator once and reuses it.
+    Failures are returned rather than raised so the caller can report every
+    failed order, not just the first.
+
+    Args:
+        order_data: Order data from Shopify API
+        target: File to stream the PDF to instead of returning it
+
+    Returns:
+        Tuple of (PDF content, None) on success or (None, error message);
+        the PDF content is None when written to target
+    """
+    global _worker_generator
+    if _worker_generator is None:
         try:
-            if hasattr(self, "image_cache_dir"):
-                shutil.rmtree(self.image_cache_dir, ignore_errors=True)
-        except:
-            pass
+            _worker_generator = DocumentGenerator()
+        except Exception as e:
+            return None, str(e)
+    return _pick_ticket_result(_worker_generator, order_data, target)
+
+
+def _pick_ticket_result(
+    generator: DocumentGenerator,
+    order_data: Dict[str, Any],
+    target: Optional[Path] = None,
+) -> Tuple[Optional[bytes], Optional[str]]:
+    """Render one pick ticket, returning any failure instead of raising it"""
+    try:
+        return generator.generate_pick_ticket(order_data, target), None
+    except Exception as e:
+        return None, str(e)
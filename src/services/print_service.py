@@ -1,20 +1,95 @@
 # src/services/print_service.py
 
+from collections import OrderedDict
+from dataclasses import dataclass, field
 from datetime import datetime
 import datetime as dt
-from typing import List, Optional, Callable, Dict
+from typing import BinaryIO, List, Optional, Callable, Dict, Tuple
 from PySide6.QtPrintSupport import QPrinter, QPrinterInfo
 import tempfile
+import io
 import os
+import shutil
 import logging
 from pathlib import Path
-from models.print_job import PrintJob, PrintJobStatus
-from queue import Queue, Empty
-from threading import Thread, Lock
+from models.print_job import PdfContent, PrintJob, PrintJobStatus
+from queue import Empty, Queue
+from threading import Event, Thread, Lock
 import time
 
 logger = logging.getLogger(__name__)
 
+# How long the list of installed printers is reused before asking the OS again
+PRINTER_CACHE_TTL = 10.0
+
+# Finished jobs whose status stays queryable; older ones are forgotten
+MAX_FINISHED_JOBS = 1024
+
+# Queued by shutdown() to wake the worker thread
+_STOP = None
+
+
+def _save_pdf(pdf_content: PdfContent, path: Path) -> None:
+    """Write a bytes-like buffer, or the rest of a binary file object, to path"""
+    try:
+        # Any buffer-protocol object (bytes, array, mmap, ...) is written as is
+        buffer = memoryview(pdf_content)
+    except TypeError:
+        buffer = None
+
+    with open(path, "wb") as dst:
+        if buffer is not None:
+            with buffer:
+                dst.write(buffer)
+        elif not _copy_file_range(pdf_content, dst):
+            shutil.copyfileobj(pdf_content, dst)
+
+
+def _copy_file_range(src: BinaryIO, dst: BinaryIO) -> bool:
+    """
+    Copy a file-backed source to dst inside the kernel
+
+    Starts at the source's current position. Returns False, having copied
+    nothing, when the source has no OS-level file (e.g. BytesIO) or the
+    platform or filesystem pair does not support copy_file_range.
+    """
+    if not hasattr(os, "copy_file_range"):
+        return False
+    try:
+        src.flush()  # Make any buffered writes visible through the fd
+        src_fd = src.fileno()
+    except (AttributeError, io.UnsupportedOperation):
+        return False
+
+    start = offset = src.tell()
+    remaining = os.fstat(src_fd).st_size - offset
+    try:
+        while remaining > 0:
+            n = os.copy_file_range(src_fd, dst.fileno(), remaining, offset_src=offset)
+            if n == 0:
+                break
+            offset += n
+            remaining -= n
+    except OSError:
+        if offset != start:
+            raise
+        return False
+    return True
+
+
+class _JobCancelled(Exception):
+    """Raised when shutdown interrupts a job that is being printed"""
+
+
+@dataclass(slots=True)
+class _JobEntry:
+    """A submitted job with its callbacks and a completion signal"""
+
+    job: PrintJob
+    on_progress: Optional[Callable[[int, int], None]]
+    on_complete: Optional[Callable[[bool, Optional[str]], None]]
+    done: Event = field(default_factory=Event)
+
 
 class PrintService:
     def __init__(self, dev_mode: bool = False):
@@ -30,10 +105,14 @@ class PrintService:
 
         # Rest of existing initialization
         self._printer = None
-        self.active_jobs: Dict[str, PrintJob] = {}
+        self._printer_cache: Optional[Tuple[float, Tuple[str, ...]]] = None
+        self._default_printer_cache: Optional[Tuple[float, Optional[str]]] = None
+        # Single source of truth for jobs; the queue only carries job IDs
+        self.jobs: Dict[str, _JobEntry] = {}
+        self._finished_jobs: "OrderedDict[str, None]" = OrderedDict()
         self.job_queue: Queue = Queue()
         self.job_lock = Lock()
-        self.running = True
+        self.stop_event = Event()
         self.print_thread = Thread(target=self._process_print_queue, daemon=True)
         self.print_thread.start()
 
@@ -54,29 +133,52 @@ class PrintService:
         """Get list of available printer names"""
         if self.dev_mode:
             return ["Development Printer", "PDF Output"]
+
+        # Enumerating printers goes through the spooler, so reuse recent results
+        now = time.monotonic()
+        if self._printer_cache and now - self._printer_cache[0] < PRINTER_CACHE_TTL:
+            return list(self._printer_cache[1])
+
         try:
-            return [
+            printers = tuple(
                 printer.printerName() for printer in QPrinterInfo.availablePrinters()
-            ]
+            )
         except Exception as e:
             logger.error(f"Error getting available printers: {str(e)}")
             return []
 
+        self._printer_cache = (now, printers)
+        return list(printers)
+
+    def invalidate_printer_cache(self) -> None:
+        """Force the next printer lookups to query the system again"""
+        self._printer_cache = None
+        self._default_printer_cache = None
+
     def get_default_printer(self) -> Optional[str]:
         """Get default printer name"""
         if self.dev_mode:
             return "Development Printer"
+
+        now = time.monotonic()
+        cached = self._default_printer_cache
+        if cached and now - cached[0] < PRINTER_CACHE_TTL:
+            return cached[1]
+
         try:
             default = QPrinterInfo.defaultPrinter()
-            return default.printerName() if default else None
+            name = default.printerName() if default else None
         except Exception as e:
             logger.error(f"Error getting default printer: {str(e)}")
             return None
 
+        self._default_printer_cache = (now, name)
+        return name
+
     def submit_print_job(
         self,
         job: PrintJob,
-        pdf_content: bytes,
+        pdf_content: PdfContent,
         on_progress: Optional[Callable[[int, int], None]] = None,
         on_complete: Optional[Callable[[bool, Optional[str]], None]] = None,
     ) -> str:
@@ -85,9 +187,9 @@ class PrintService:
             job.pdf_content = pdf_content
 
             with self.job_lock:
-                self.active_jobs[job.id] = job
+                self.jobs[job.id] = _JobEntry(job, on_progress, on_complete)
 
-            self.job_queue.put((job, on_progress, on_complete))
+            self.job_queue.put(job.id)
             logger.info(f"Submitted print job {job.id} for {len(job.order_ids)} orders")
 
             return job.id
@@ -99,27 +201,44 @@ class PrintService:
     def get_job_status(self, job_id: str) -> Optional[PrintJobStatus]:
         """Get current status of a print job"""
         with self.job_lock:
-            job = self.active_jobs.get(job_id)
-            return job.status if job else None
+            entry = self.jobs.get(job_id)
+            return entry.job.status if entry else None
+
+    def wait_for_job(
+        self, job_id: str, timeout: Optional[float] = None
+    ) -> Optional[PrintJobStatus]:
+        """Block until a job finishes or the timeout expires, then get its status"""
+        with self.job_lock:
+            entry = self.jobs.get(job_id)
+        if entry is None:
+            return None
+        entry.done.wait(timeout)
+        return entry.job.status
 
     def shutdown(self):
         """Gracefully shut down the print service"""
-        self.running = False
+        self.stop_event.set()
         if self.print_thread.is_alive():
+            self.job_queue.put(_STOP)
             self.print_thread.join(timeout=5.0)
 
     def _process_print_queue(self):
         """Background thread for processing print jobs"""
-        while self.running:
+        while True:
             try:
-                # Get next job from queue with timeout
-                try:
-                    job, on_progress, on_complete = self.job_queue.get(timeout=1.0)
-                except Empty:
-                    continue  # No job available, continue polling
+                # Block until a job arrives or shutdown() wakes us
+                job_id = self.job_queue.get()
+                if job_id is _STOP or self.stop_event.is_set():
+                    if job_id is not _STOP:
+                        self._cancel_job(job_id)
+                    self.job_queue.task_done()
+                    break
 
                 with self.job_lock:
+                    entry = self.jobs[job_id]
+                    job = entry.job
                     job.status = PrintJobStatus.PROCESSING
+                on_progress, on_complete = entry.on_progress, entry.on_complete
 
                 # Process the job
                 try:
@@ -137,6 +256,9 @@ class PrintService:
                     if on_complete:
                         on_complete(success, job.error_message)
 
+                except _JobCancelled:
+                    self._cancel_job(job.id)
+
                 except Exception as e:
                     logger.error(f"Error processing print job {job.id}: {str(e)}")
                     with self.job_lock:
@@ -147,14 +269,52 @@ class PrintService:
                         on_complete(False, str(e))
 
                 finally:
+                    # The PDF is no longer needed once the job is done
+                    job.pdf_content = None
+                    entry.done.set()
+                    self._retire_job(job.id)
                     self.job_queue.task_done()
 
             except Exception as e:
                 logger.error(f"Error in print queue processor: {str(e)}")
-                time.sleep(1)  # Brief pause before retrying
+                self.stop_event.wait(1)  # Brief pause before retrying
+
+        # Jobs still queued will never run; release anyone waiting on them
+        while True:
+            try:
+                job_id = self.job_queue.get_nowait()
+            except Empty:
+                break
+            if job_id is not _STOP:
+                self._cancel_job(job_id)
+            self.job_queue.task_done()
 
         logger.info("Print queue processor shutting down")
 
+    def _cancel_job(self, job_id: str) -> None:
+        """Mark a job stopped by shutdown as cancelled and wake its waiters"""
+        with self.job_lock:
+            entry = self.jobs.get(job_id)
+            if entry is None:
+                return
+            entry.job.status = PrintJobStatus.CANCELLED
+            entry.job.error_message = "Print job cancelled"
+            entry.job.pdf_content = None
+
+        if entry.on_complete:
+            entry.on_complete(False, entry.job.error_message)
+        entry.done.set()
+        self._retire_job(job_id)
+
+    def _retire_job(self, job_id: str) -> None:
+        """Record a finished job, dropping the oldest beyond MAX_FINISHED_JOBS"""
+        with self.job_lock:
+            finished = self._finished_jobs
+            finished[job_id] = None
+            while len(finished) > MAX_FINISHED_JOBS:
+                old_id, _ = finished.popitem(last=False)
+                self.jobs.pop(old_id, None)
+
     def _print_job(self, job: PrintJob, on_progress: Optional[Callable] = None) -> bool:
         """Process a single print job"""
         if not job.pdf_content:
@@ -170,8 +330,7 @@ class PrintService:
 
                 logger.info(f"[DEV MODE] Attempting to save PDF to: {output_path}")
 
-                with open(output_path, "wb") as f:
-                    f.write(job.pdf_content)
+                _save_pdf(job.pdf_content, output_path)
 
                 logger.info(f"[DEV MODE] Successfully saved PDF to: {output_path}")
 
@@ -180,11 +339,17 @@ class PrintService:
                 for step in range(total_steps):
                     if on_progress:
                         on_progress(step + 1, total_steps)
-                    time.sleep(0.5)  # Simulate processing time
+                    # Simulate processing time; shutdown interrupts the wait
+                    if self.stop_event.wait(0.5):
+                        logger.info(f"[DEV MODE] Print job {job.id} interrupted")
+                        raise _JobCancelled(job.id)
 
                 logger.info(f"[DEV MODE] Completed simulated print job {job.id}")
                 return True
 
+            except _JobCancelled:
+                raise
+
             except Exception as e:
                 logger.error(f"[DEV MODE] Error saving PDF: {str(e)}")
                 logger.exception(
@@ -1,11 +1,18 @@
 # src/services/shopify_client.py
 
 import logging
-from typing import Dict, Optional, Any
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional, Any, Tuple
 import shopify
 import os
+import threading
 from dotenv import load_dotenv
-import json
+import orjson
+import requests
+from requests.adapters import HTTPAdapter
+from models.order import OrderRow, parse_order_rows
+from utils.dicts import dig
+from utils.logger import dumps
 
 # Set up logging
 logger = logging.getLogger(__name__)
@@ -20,6 +27,141 @@ API_SECRET = os.getenv("API_SECRET")
 SHOP_URL = os.getenv("SHOP_URL")
 ACCESS_TOKEN = os.getenv("ACCESS_TOKEN")
 
+# Seconds to wait for a GraphQL response before giving up
+REQUEST_TIMEOUT = 30
+
+# Sessions already set up, keyed by (shop_url, access_token)
+_SESSION_CACHE: Dict[Tuple[str, str], shopify.Session] = {}
+_SESSION_LOCK = threading.Lock()
+
+# Orders per detail request. Each order adds the full detail fragment to
+# the query cost; a batch Shopify rejects as too costly is split and retried
+ORDER_DETAILS_BATCH_SIZE = 10
+
+# Detail requests in flight at once for large selections
+ORDER_DETAILS_WORKERS = 4
+
+# Fields needed to render a pick ticket, shared by the order detail queries
+_ORDER_DETAILS_FRAGMENT = """
+fragment OrderDetails on Order {
+  id
+  name
+  createdAt
+  tags
+  note
+  displayFinancialStatus
+  displayFulfillmentStatus
+  email
+  phone
+  totalPriceSet {
+    shopMoney {
+      amount
+      currencyCode
+    }
+  }
+  shippingAddress {
+    firstName
+    lastName
+    address1
+    address2
+    city
+    province
+    zip
+    country
+    phone
+  }
+  lineItems(first: 50) {
+    edges {
+      node {
+        quantity
+        sku
+        vendor
+        product {
+          title
+        }
+        variant {
+          title
+          image {
+            url
+          }
+          inventoryItem {
+            inventoryLevels(first: 100) {
+              edges {
+                node {
+                  location {
+                    name
+                  }
+                  quantities(names: ["available"]) {
+                    name
+                    quantity
+                  }
+                }
+              }
+            }
+          }
+        }
+      }
+    }
+  }
+  shippingLines(first: 1) {
+    edges {
+      node {
+        title
+        code
+      }
+    }
+  }
+}
+"""
+
+
+# Queries are built once at import rather than on every call
+_UNPRINTED_ORDERS_QUERY = """
+query GetManyOrders($first: Int!, $query: String) {
+  orders(first: $first, query: $query, sortKey: CREATED_AT, reverse: true) {
+    edges {
+      node {
+        id
+        createdAt
+        tags
+        totalPriceSet {
+          shopMoney {
+            amount
+            currencyCode
+          }
+        }
+        shippingAddress {
+          city
+          province
+          name
+        }
+        name
+      }
+    }
+    pageInfo {
+      hasNextPage
+      endCursor
+    }
+  }
+}
+"""
+
+_ORDER_DETAILS_QUERY = """
+query GetOrder($id: ID!) {
+  order(id: $id) {
+    ...OrderDetails
+  }
+}
+""" + _ORDER_DETAILS_FRAGMENT
+
+_ORDERS_DETAILS_QUERY = """
+query GetOrders($ids: [ID!]!) {
+  nodes(ids: $ids) {
+    ...OrderDetails
+  }
+}
+""" + _ORDER_DETAILS_FRAGMENT
+
 
 class ShopifyError(Exception):
     """Base exception for Shopify client errors"""
@@ -59,12 +201,56 @@ class ShopifyClient:
             ShopifyError: If session initialization fails
         """
         try:
-            shopify.Session.setup(api_key=self.access_token, secret=None)
-            session = shopify.Session(self.shop_url, API_VERSION, self.access_token)
-            shopify.ShopifyResource.activate_session(session)
+            key = (self.shop_url, self.access_token)
+            with _SESSION_LOCK:
+                session = _SESSION_CACHE.get(key)
+                if session is None:
+                    shopify.Session.setup(api_key=self.access_token, secret=None)
+                    session = shopify.Session(
+                        self.shop_url, API_VERSION, self.access_token
+                    )
+                    _SESSION_CACHE[key] = session
+                shopify.ShopifyResource.activate_session(session)
+                # The session headers are thread-local in the shopify library,
+                # so capture them once in an HTTP session that worker threads
+                # can share; it also keeps connections alive between queries
+                site = shopify.ShopifyResource.get_site()
+                headers = dict(shopify.ShopifyResource.get_headers())
+
+            self._endpoint = site + "/graphql.json"
+            self._http = requests.Session()
+            self._http.headers.update(
+                {"Accept": "application/json", "Content-Type": "application/json"}
+            )
+            self._http.headers.update(headers)
+            self._http.mount(
+                "https://", HTTPAdapter(pool_connections=10, pool_maxsize=20)
+            )
         except Exception as e:
             raise ShopifyError(f"Failed to initialize Shopify session: {str(e)}")
 
+    def _execute(self, query: str, variables: Optional[Dict[str, Any]] = None) -> bytes:
+        """
+        Send a GraphQL query over the pooled HTTP session
+
+        Returns:
+            Raw JSON response body, undecoded so the parser reads it directly
+
+        Raises:
+            requests.RequestException: If the request fails
+        """
+        response = self._http.post(
+            self._endpoint,
+            json={"query": query, "variables": variables},
+            timeout=REQUEST_TIMEOUT,
+        )
+        response.raise_for_status()
+        return response.content
+
+    def close(self) -> None:
+        """Release pooled HTTP connections"""
+        self._http.close()
+
     def get_unprinted_orders(self, limit: int = 200) -> Dict[str, Any]:
         """
         Fetch unprinted orders using GraphQL query
@@ -79,131 +265,120 @@ class ShopifyClient:
             ShopifyError: If the query fails
         """
         try:
-            client = shopify.GraphQL()
-            query = """
-            query GetManyOrders($first: Int!, $query: String) {
-              orders(first: $first, query: $query, sortKey: CREATED_AT, reverse: true) {
-                edges {
-                  node {
-                    id
-                    createdAt
-                    tags
-                    totalPriceSet {
-                      shopMoney {
-                        amount
-                        currencyCode
-                      }
-                    }
-                    shippingAddress {
-                      city
-                      province
-                      name
-                    }
-                    name
-                  }
-                }
-                pageInfo {
-                  hasNextPage
-                  endCursor
-                }
-              }
-            }
-            """
             variables = {"first": limit, "query": "tag_not:printed AND status:open"}
-            result = client.execute(query, variables)
-            result_dict = json.loads(result)  # Parse the JSON string into a dictionary
+            result = self._execute(_UNPRINTED_ORDERS_QUERY, variables)
+            result_dict = orjson.loads(result)
             if "errors" in result_dict:
                 raise ShopifyError(f"GraphQL query failed: {result_dict['errors']}")
             return result_dict
         except Exception as e:
             raise ShopifyError(f"Failed to fetch unprinted orders: {str(e)}")
 
+    def get_unprinted_order_rows(self, limit: int = 200) -> List[OrderRow]:
+        """
+        Fetch unprinted orders normalized into display rows
+
+        Args:
+            limit: Maximum number of orders to fetch
+
+        Returns:
+            List of OrderRow, newest first
+
+        Raises:
+            ShopifyError: If the query fails
+        """
+        result = self.get_unprinted_orders(limit)
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Raw Shopify response:\n%s", dumps(result))
+        return parse_order_rows(result)
+
     def get_order_details(self, order_id: str) -> Dict[str, Any]:
         """Fetch detailed information for a single order using GraphQL"""
         try:
-            client = shopify.GraphQL()
-            query = """
-            query GetOrder($id: ID!) {
-              order(id: $id) {
-                id
-                name
-                createdAt
-                tags
-                note
-                displayFinancialStatus
-                displayFulfillmentStatus
-                email
-                phone
-                totalPriceSet {
-                  shopMoney {
-                    amount
-                    currencyCode
-                  }
-                }
-                shippingAddress {
-                  firstName
-                  lastName
-                  address1
-                  address2
-                  city
-                  province
-                  zip
-                  country
-                  phone
-                }
-                lineItems(first: 50) {
-                  edges {
-                    node {
-                      quantity
-                      sku
-                      vendor
-                      product {
-                        title
-                      }
-                      variant {
-                        title
-                        image {
-                          url
-                        }
-                        inventoryItem {
-                          inventoryLevels(first: 100) {
-                            edges {
-                              node {
-                                location {
-                                  name
-                                }
-                                quantities(names: ["available"]) {
-                                  name
-                                  quantity
-                                }
-                              }
-                            }
-                          }
-                        }
-                      }
-                    }
-                  }
-                }
-                shippingLines(first: 1) {
-                  edges {
-                    node {
-                      title
-                      code
-                    }
-                  }
-                }
-              }
-            }
-            """
             variables = {"id": order_id}
-            result = client.execute(query, variables)
-            result_dict = json.loads(result)
+            result = self._execute(_ORDER_DETAILS_QUERY, variables)
+            result_dict = orjson.loads(result)
             if "errors" in result_dict:
                 raise ShopifyError(f"GraphQL query failed: {result_dict['errors']}")
             return result_dict
         except Exception as e:
             raise ShopifyError(f"Failed to fetch order details: {str(e)}")
 
+    def get_orders_details(self, order_ids: List[str]) -> Dict[str, Any]:
+        """
+        Fetch detailed information for several orders
+
+        IDs are sent ORDER_DETAILS_BATCH_SIZE at a time, with up to
+        ORDER_DETAILS_WORKERS requests in flight
+
+        Args:
+            order_ids: Order GIDs to fetch
+
+        Returns:
+            Dict whose data.nodes lists one order per ID, in the same order;
+            an entry is None if that order could not be found
+
+        Raises:
+            ShopifyError: If the query fails
+        """
+        order_ids = list(order_ids)
+        size = ORDER_DETAILS_BATCH_SIZE
+        batches = [order_ids[i : i + size] for i in range(0, len(order_ids), size)]
+        if len(batches) <= 1:
+            return self._get_nodes_details(order_ids)
+
+        workers = min(len(batches), ORDER_DETAILS_WORKERS)
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            results = list(executor.map(self._get_nodes_details, batches))
+
+        nodes = [
+            node for result in results for node in dig(result, "data", "nodes") or ()
+        ]
+        return {"data": {"nodes": nodes}}
+
+    def _get_nodes_details(self, order_ids: List[str]) -> Dict[str, Any]:
+        """
+        Fetch one batch of orders in a single GraphQL nodes query
+
+        A batch over Shopify's single-query cost limit is split in half and
+        each half fetched separately, keeping the IDs in order
+        """
+        try:
+            variables = {"ids": order_ids}
+            result = self._execute(_ORDERS_DETAILS_QUERY, variables)
+            result_dict = orjson.loads(result)
+        except Exception as e:
+            raise ShopifyError(f"Failed to fetch order details: {str(e)}")
+
+        errors = result_dict.get("errors")
+        if not errors:
+            return result_dict
+
+        if len(order_ids) > 1 and _is_max_cost_exceeded(errors):
+            mid = len(order_ids) // 2
+            logger.warning(
+                "Order details query for %d orders exceeds the cost limit; "
+                "splitting it",
+                len(order_ids),
+            )
+            nodes = [
+                node
+                for half in (order_ids[:mid], order_ids[mid:])
+                for node in dig(self._get_nodes_details(half), "data", "nodes") or ()
+            ]
+            return {"data": {"nodes": nodes}}
+
+        raise ShopifyError(
+            f"Failed to fetch order details: GraphQL query failed: {errors}"
+        )
+
+
+def _is_max_cost_exceeded(errors: Any) -> bool:
+    """Check whether GraphQL errors include Shopify's query cost limit"""
+    return isinstance(errors, list) and any(
+        dig(error, "extensions", "code") == "MAX_COST_EXCEEDED" for error in errors
+    )
+
 
 def create_client() -> ShopifyClient:
     """
@@ -0,0 +1,52 @@
+# src/utils/dates.py
+from datetime import datetime
+from functools import lru_cache
+from typing import Any, Optional
+import sys
+
+if sys.version_info >= (3, 11):
+    # fromisoformat accepts the trailing "Z" natively from 3.11 on
+    _parse_iso = datetime.fromisoformat
+else:
+
+    def _parse_iso(value: str) -> datetime:
+        return datetime.fromisoformat(value.replace("Z", "+00:00"))
+
+
+def format_iso_timestamp(value: Any) -> Optional[str]:
+    """
+    Format an ISO-8601 timestamp for display as YYYY-MM-DD HH:MM
+
+    Args:
+        value: Timestamp string, e.g. Shopify's 2024-01-15T10:30:00Z
+
+    Returns:
+        The formatted timestamp, or None if value is not a valid timestamp
+    """
+    # Checked before the cached lookup, which would reject unhashable values
+    if not value or not isinstance(value, str):
+        return None
+    return _format_iso_timestamp(value)
+
+
+@lru_cache(maxsize=4096)
+def _format_iso_timestamp(value: str) -> Optional[str]:
+    """Format a non-empty timestamp string; memoized so repeats parse once"""
+    try:
+        parsed = _parse_iso(value)
+    except ValueError:
+        return None
+
+    # Shopify's fixed UTC shape: once parsed and validated, the display text
+    # is a slice of the input rather than a strftime call
+    if (
+        len(value) == 20
+        and value[4] == "-"
+        and value[7] == "-"
+        and value[10] == "T"
+        and value[13] == ":"
+        and value[16] == ":"
+        and value[19] == "Z"
+    ):
+        return f"{value[:10]} {value[11:16]}"
+    return parsed.strftime("%Y-%m-%d %H:%M")
@@ -0,0 +1,32 @@
+# src/utils/dicts.py
+from types import MappingProxyType
+from typing import Any, Mapping
+
+_MISSING = object()
+
+# Shared read-only stand-in for missing nested objects
+EMPTY: Mapping[str, Any] = MappingProxyType({})
+
+
+def dig(data: Any, *keys: str, default: Any = None) -> Any:
+    """
+    Walk nested dictionaries without allocating placeholder dicts
+
+    Equivalent to data.get(k1, {}).get(k2, {})...get(kn, default), but stops
+    at the first missing key or non-dict value instead.
+
+    Args:
+        data: Root dictionary
+        keys: Keys to follow in order
+        default: Value returned when the path does not exist
+
+    Returns:
+        The value at the end of the path, or default
+    """
+    for key in keys:
+        if not isinstance(data, dict):
+            return default
+        data = data.get(key, _MISSING)
+        if data is _MISSING:
+            return default
+    return data
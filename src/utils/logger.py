@@ -0,0 +1,10 @@
+# src/utils/logger.py
+from typing import Any
+
+import orjson
+
+
+def dumps(data: Any) -> str:
+    """Pretty-print data as JSON for log output"""
+    # default=dict covers read-only mappings such as MappingProxyType
+    return orjson.dumps(data, default=dict, option=orjson.OPT_INDENT_2).decode()
@@ -0,0 +1,115 @@
+import copy
+from types import MappingProxyType
+
+import pytest
+from services.document_generator import DocumentGenerator
+
+# Sample order matching Shopify's structure, built once. Read-only at the top
+# level; tests that need to change it take a copy from make_order
+_SAMPLE_ORDER = MappingProxyType(
+    {
+        "id": "gid://shopify/Order/12345",
+        "name": "#1001",
+        "createdAt": "2024-01-15T10:30:00Z",
+        "note": "Please handle with care",
+        "shippingAddress": {
+            "firstName": "John",
+            "lastName": "Doe",
+            "company": "ACME Corp",
+            "address1": "123 Main St",
+            "address2": "Suite 100",
+            "city": "Springfield",
+            "province": "IL",
+            "zip": "62701",
+            "country": "United States",
+            "phone": "555-123-4567",
+        },
+        "totalPriceSet": {"shopMoney": {"amount": "156.99", "currencyCode": "USD"}},
+        "lineItems": {
+            "edges": [
+                {
+                    "node": {
+                        "sku": "WIDGET-001",
+                        "quantity": 2,
+                        "vendor": "WidgetCo",
+                        "product": {"title": "Premium Widget"},
+                        "variant": {
+                            "title": "Blue / Large",
+                            "inventoryItem": {
+                                "inventoryLevels": {
+                                    "edges": [
+                                        {
+                                            "node": {
+                                                "location": {"name": "Main Warehouse"}
+                                            }
+                                        }
+                                    ]
+                                }
+                            },
+                        },
+                    }
+                }
+            ]
+        },
+        "fulfillmentOrders": {
+            "edges": [{"node": {"deliveryMethod": {"methodType": "SHIPPING"}}}]
+        },
+    }
+)
+
+
+@pytest.fixture(scope="session")
+def document_generator(request, tmp_path_factory):
+    """Fixture sharing one read-only DocumentGenerator across all tests"""
+    # Keep compiled templates in pytest's cache so repeat runs skip compiling,
+    # without touching the app's own cache in the system temp dir
+    cache = getattr(request.config, "cache", None)  # None with -p no:cacheprovider
+    cache_dir = cache.mkdir("jinja") if cache else tmp_path_factory.mktemp("jinja")
+    return DocumentGenerator(bytecode_cache_dir=cache_dir)
+
+
+@pytest.fixture(scope="session")
+def sample_order_data():
+    """Fixture providing sample order data matching Shopify's structure"""
+    return _SAMPLE_ORDER
+
+
+@pytest.fixture(scope="session")
+def make_order():
+    """Fixture returning a factory for mutable copies of the sample order"""
+
+    def make(**overrides):
+        order = copy.deepcopy(dict(_SAMPLE_ORDER))
+        order.update(overrides)
+        return order
+
+    return make
+
+
+@pytest.fixture(scope="session")
+def batch_orders():
+    """Fixture providing a two-order batch that differs only in order number"""
+    # Each order overlays its delta on the shared sample; nested data is
+    # shared too, which is safe because rendering never mutates orders
+    deltas = [{"name": "#1001"}, {"name": "#1002"}]
+    return [{**_SAMPLE_ORDER, **delta} for delta in deltas]
+
+
+@pytest.fixture(scope="session")
+def pick_ticket_template(document_generator):
+    """Fixture providing the compiled pick ticket template"""
+    # The generator's environment has auto_reload off, so this never re-stats
+    return document_generator.env.get_template("pick_ticket.html")
+
+
+@pytest.fixture(scope="session")
+def rendered_html(document_generator, pick_ticket_template, sample_order_data):
+    """Fixture rendering the sample order's pick ticket HTML once"""
+    template_data = document_generator._process_order_data(sample_order_data)
+    return pick_ticket_template.render(**template_data)
+
+
+@pytest.fixture(scope="session")
+def rendered_pdf(document_generator, sample_order_data):
+    """Fixture generating the sample order's pick ticket PDF once"""
+    return document_generator.generate_pick_ticket(sample_order_data)
@@ -2,70 +2,21 @@ import pytest
 from pathlib import Path
 import os
 from datetime import datetime
-from src.services.document_generator import DocumentGenerator
 from PyPDF2 import PdfReader
+from services.document_generator import DocumentGenerator
 import io
 import tempfile
 import json
+import requests
 
 
-@pytest.fixture
-def document_generator():
-    """Fixture to create a DocumentGenerator instance"""
-    return DocumentGenerator()
-
-
-@pytest.fixture
-def sample_order_data():
-    """Fixture providing sample order data matching Shopify's structure"""
-    return {
-        "id": "gid://shopify/Order/12345",
-        "name": "#1001",
-        "createdAt": "2024-01-15T10:30:00Z",
-        "note": "Please handle with care",
-        "shippingAddress": {
-            "firstName": "John",
-            "lastName": "Doe",
-            "company": "ACME Corp",
-            "address1": "123 Main St",
-            "address2": "Suite 100",
-            "city": "Springfield",
-            "province": "IL",
-            "zip": "62701",
-            "country": "United States",
-            "phone": "555-123-4567",
-        },
-        "totalPriceSet": {"shopMoney": {"amount": "156.99", "currencyCode": "USD"}},
-        "lineItems": {
-            "edges": [
-                {
-                    "node": {
-                        "sku": "WIDGET-001",
-                        "quantity": 2,
-                        "vendor": "WidgetCo",
-                        "product": {"title": "Premium Widget"},
-                        "variant": {
-                            "title": "Blue / Large",
-                            "inventoryItem": {
-                                "inventoryLevels": {
-                                    "edges": [
-                                        {
-                                            "node": {
-                                                "location": {"name": "Main Warehouse"}
-                                            }
-                                        }
-                                    ]
-                                }
-                            },
-                        },
-                    }
-                }
-            ]
-        },
-        "fulfillmentOrders": {
-            "edges": [{"node": {"deliveryMethod": {"methodType": "SHIPPING"}}}]
-        },
-    }
+def _page_count(pdf_content: bytes) -> int:
+    """Page count from the PDF's root page tree, without loading any page"""
+    assert pdf_content.startswith(b"%PDF-")
+    assert pdf_content.rstrip().endswith(b"%%EOF")
+    # Page objects sit in compressed object streams, so they can't be counted
+    # by scanning bytes; the page tree root records the total
+    return PdfReader(io.BytesIO(pdf_content)).trailer["/Root"]["/Pages"]["/Count"]
 
 
 def test_initialization(document_generator):
@@ -76,6 +27,15 @@ def test_initialization(document_generator):
     assert (document_generator.template_dir / "styles" / "print.css").exists()
 
 
+def test_templates_compile_into_bytecode_cache(tmp_path):
+    """Test that templates compile into the bytecode cache for later runs"""
+    # A fresh directory, since the shared generator's cache persists across runs
+    generator = DocumentGenerator(bytecode_cache_dir=tmp_path)
+    generator.http.close()
+
+    assert list(tmp_path.glob("__jinja2_*.cache"))
+
+
 def test_format_date_filter(document_generator):
     """Test the custom date formatting filter"""
     test_date = "2024-01-15T10:30:00Z"
@@ -88,6 +48,32 @@ def test_format_date_filter(document_generator):
     # Test empty date
     assert document_generator._format_date("") == ""
 
+    # Non-string values, hashable or not, pass through unchanged
+    for value in [12345, ["2024-01-15T10:30:00Z"], {"date": "2024-01-15"}]:
+        assert document_generator._format_date(value) == value
+
+    # The fixed-shape fast path must match full parsing and strftime
+    def reference(value):
+        try:
+            parsed = datetime.fromisoformat(value.replace("Z", "+00:00"))
+            return parsed.strftime("%Y-%m-%d %H:%M")
+        except ValueError:
+            return value
+
+    for value in [
+        "2024-01-15T10:30:00Z",
+        "1999-12-31T23:59:59Z",
+        "2024-02-29T00:00:00Z",
+        "2024-02-30T10:30:00Z",
+        "2024-13-01T10:30:00Z",
+        "2024-01-15T24:00:00Z",
+        "2024-01-15T10:30:00.123Z",
+        "2024-01-15T10:30:00-05:00",
+        "2024-01-15T10:30Z",
+        "2024-01-15",
+    ]:
+        assert document_generator._format_date(value) == reference(value), value
+
 
 def test_process_line_items(document_generator, sample_order_data):
     """Test line item processing from order data"""
@@ -101,20 +87,21 @@ def test_process_line_items(document_generator, sample_order_data):
     assert item["title"] == "Premium Widget"
     assert item["variant_title"] == "Blue / Large"
     assert item["vendor"] == "WidgetCo"
-    assert item["locations"] == ["Main Warehouse"]
+    assert item["locations"] == [{"name": "Main Warehouse", "quantity": 0}]
 
 
 def test_process_order_data(document_generator, sample_order_data):
     """Test order data processing for template"""
     processed_data = document_generator._process_order_data(sample_order_data)
+    order = processed_data["order"]
 
-    assert processed_data["order_number"] == "#1001"
-    assert processed_data["created_at"] == "2024-01-15T10:30:00Z"
-    assert processed_data["note"] == "Please handle with care"
-    assert processed_data["total"] == "156.99"
+    assert order["number"] == "#1001"
+    assert order["created_at"] == "2024-01-15T10:30:00Z"
+    assert order["note"] == "Please handle with care"
+    assert order["total"] == "156.99"
 
     # Check shipping address
-    shipping = processed_data["shipping_address"]
+    shipping = order["shipping_address"]
     assert shipping["name"] == "John Doe"
     assert shipping["company"] == "ACME Corp"
     assert shipping["address1"] == "123 Main St"
@@ -122,66 +109,139 @@ def test_process_order_data(document_generator, sample_order_data):
     assert shipping["province"] == "IL"
 
     # Check line items
-    assert len(processed_data["line_items"]) == 1
-    assert processed_data["shipping_method"] == "SHIPPING"
+    assert len(order["line_items"]) == 1
+    # The sample has no shippingLines, so the default method is shown
+    assert order["shipping_method"] == "Standard Shipping"
 
 
-def test_generate_pick_ticket(document_generator, sample_order_data):
-    """Test PDF generation for a single order"""
-    pdf_content = document_generator.generate_pick_ticket(sample_order_data)
+def test_process_order_data_bench(request, document_generator, sample_order_data):
+    """Benchmark template data extraction, the per-order hot path"""
+    pytest.importorskip("pytest_benchmark")
+    benchmark = request.getfixturevalue("benchmark")
 
-    assert pdf_content is not None
-    assert len(pdf_content) > 0
+    result = benchmark.pedantic(
+        document_generator._process_order_data,
+        args=(sample_order_data,),
+        rounds=100,
+        warmup_rounds=5,
+    )
+    assert result["order"]["number"] == "#1001"
+
+
+@pytest.mark.slow
+def test_pdf_smoke(rendered_pdf):
+    """Smoke test full PDF generation for a single order"""
+    assert rendered_pdf is not None
+    assert len(rendered_pdf) > 0
 
     # Verify PDF structure
-    pdf = PdfReader(io.BytesIO(pdf_content))
+    pdf = PdfReader(io.BytesIO(rendered_pdf))
     assert len(pdf.pages) == 1  # Each order should be one page
 
 
-def test_generate_batch_pick_tickets(document_generator, sample_order_data):
-    """Test batch PDF generation"""
-    # Create multiple orders
-    orders = [sample_order_data, sample_order_data.copy()]
-    orders[1]["name"] = "#1002"  # Change order number for second order
-
-    pdfs = document_generator.generate_batch_pick_tickets(orders)
+@pytest.fixture(params=["#1001", "#1002"])
+def order_variant(request, make_order):
+    """Fixture providing an independent copy of the sample order, renamed"""
+    return make_order(name=request.param)
 
-    assert len(pdfs) == 2
-    for pdf_content in pdfs:
-        assert len(pdf_content) > 0
-        pdf = PdfReader(io.BytesIO(pdf_content))
-        assert len(pdf.pages) == 1
 
+@pytest.mark.slow
+def test_generate_batch_pick_tickets(document_generator, make_order, order_variant):
+    """Test batch PDF generation, including repeated order numbers"""
+    pdfs = document_generator.generate_batch_pick_tickets([make_order(), order_variant])
 
+    assert len(pdfs) == 2
+    assert all(_page_count(pdf) == 1 for pdf in pdfs)
+
+
+def test_render_order_variants(document_generator, pick_ticket_template, order_variant):
+    """Test each order's number reaches its rendered pick ticket"""
+    template_data = document_generator._process_order_data(order_variant)
+    html_content = pick_ticket_template.render(**template_data)
+
+    assert order_variant["name"] in html_content
+    assert html_content.count("order-container") == 1
+
+
+@pytest.mark.slow
+def test_generate_batch_pick_tickets_to_dir(document_generator, batch_orders, tmp_path):
+    """Test batch PDF generation straight to files"""
+    paths = document_generator.generate_batch_pick_tickets_to_dir(
+        batch_orders, tmp_path
+    )
+
+    assert [path.name for path in paths] == ["0001_1001.pdf", "0002_1002.pdf"]
+    assert all(_page_count(path.read_bytes()) == 1 for path in paths)
+
+
+@pytest.mark.slow
+def test_generate_combined_pick_tickets(document_generator, batch_orders):
+    """Test combined PDF generation for several orders"""
+    pdf_content = document_generator.generate_combined_pick_tickets(batch_orders)
+
+    assert _page_count(pdf_content) == 2  # One page per order
+
+
+@pytest.mark.parametrize(
+    "invalid_order",
+    [
+        {},
+        {"id": "test", "name": "#1003"},  # Missing other required fields
+        {"data": {"order": None}},
+        {"data": {"order": {"name": "#1003", "lineItems": {"edges": []}}}},
+    ],
+)
+def test_validate_order_payload(document_generator, invalid_order):
+    """Test invalid order data is rejected before any rendering"""
+    with pytest.raises(ValueError):
+        document_generator._validate_order_payload(invalid_order)
+
+
+@pytest.mark.parametrize("payload", [None, ["#1003"], "#1003"])
+@pytest.mark.parametrize(
+    "method",
+    [
+        "generate_combined_pick_tickets",
+        "generate_batch_pick_tickets",
+        "generate_batch_pick_tickets_to_dir",
+    ],
+)
+def test_non_mapping_payload_reports_validation_error(
+    document_generator, payload, method, tmp_path
+):
+    """Test a payload that is not an order fails validation, not on its name"""
+    args = (tmp_path,) if method.endswith("_to_dir") else ()
+    with pytest.raises(Exception, match="Order Unknown: Invalid order data"):
+        getattr(document_generator, method)([payload], *args)
+
+
+def test_validate_order_payload_accepts(document_generator, sample_order_data):
+    """Test complete orders pass, direct or nested, even without an address"""
+    document_generator._validate_order_payload(sample_order_data)
+    document_generator._validate_order_payload({"data": {"order": sample_order_data}})
+    document_generator._validate_order_payload(
+        {**sample_order_data, "shippingAddress": None}
+    )
+
+
+@pytest.mark.slow
 def test_error_handling(document_generator):
     """Test error handling for invalid data"""
-    # Test with empty order data
-    with pytest.raises(Exception):
-        document_generator.generate_pick_ticket({})
+    # One end-to-end case; the validator tests cover the rest
+    with pytest.raises(ValueError):
+        document_generator.generate_pick_ticket({"id": "test", "name": "#1003"})
 
-    # Test with missing required fields
-    invalid_order = {
-        "id": "test",
-        "name": "#1003",
-        # Missing other required fields
-    }
-    with pytest.raises(Exception):
-        document_generator.generate_pick_ticket(invalid_order)
 
-
-def test_template_rendering(document_generator, sample_order_data):
+def test_template_rendering(rendered_html, sample_order_data):
     """Test template rendering without PDF generation"""
-    template_data = document_generator._process_order_data(sample_order_data)
-    template = document_generator.env.get_template("pick_ticket.html")
-    html_content = template.render(**template_data)
-
     # Verify essential elements in HTML
-    assert sample_order_data["name"] in html_content
-    assert "John Doe" in html_content
-    assert "Premium Widget" in html_content
-    assert "WIDGET-001" in html_content
+    assert sample_order_data["name"] in rendered_html
+    assert "John Doe" in rendered_html
+    assert "Premium Widget" in rendered_html
+    assert "WIDGET-001" in rendered_html
 
 
+@pytest.mark.slow
 def test_css_loading(document_generator):
     """Test CSS file loading"""
     assert document_generator.base_css is not None
@@ -193,3 +253,62 @@ def test_css_loading(document_generator):
 
     assert base_css_path.exists()
     assert print_css_path.exists()
+
+
+@pytest.mark.slow
+def test_css_parsed_once(monkeypatch, sample_order_data, tmp_path):
+    """Test stylesheets are parsed once and shared by every generator"""
+    import weasyprint
+
+    parsed = []
+
+    class CountingCSS(weasyprint.CSS):
+        def __init__(self, *args, **kwargs):
+            parsed.append(kwargs.get("filename"))
+            super().__init__(*args, **kwargs)
+
+    monkeypatch.setattr(weasyprint, "CSS", CountingCSS)
+    monkeypatch.setattr(DocumentGenerator, "_shared_css", None)
+
+    first = DocumentGenerator(bytecode_cache_dir=tmp_path)
+    second = DocumentGenerator(bytecode_cache_dir=tmp_path)
+    first.generate_pick_ticket(sample_order_data)
+    second.generate_pick_ticket(sample_order_data)
+
+    assert len(parsed) == 2  # base.css and print.css, once each
+    assert first.base_css is second.base_css
+    assert first.print_css is second.print_css
+
+
+class BrokenStream:
+    """Response body that fails partway through the download"""
+
+    def __init__(self):
+        self.sent = False
+
+    def read(self, size=-1):
+        if self.sent:
+            raise ConnectionError("Connection dropped")
+        self.sent = True
+        return b"\xff\xd8\xff" + b"\0" * 1024
+
+
+class BrokenDownloads:
+    """Stands in for the generator's HTTP session"""
+
+    def get(self, url, stream=False, timeout=None):
+        response = requests.Response()
+        response.status_code = 200
+        response.raw = BrokenStream()
+        return response
+
+
+def test_failed_download_leaves_no_cached_file(
+    document_generator, monkeypatch, tmp_path
+):
+    """Test an interrupted download leaves nothing behind to be reused"""
+    monkeypatch.setattr(document_generator, "image_cache_dir", tmp_path)
+    monkeypatch.setattr(document_generator, "http", BrokenDownloads())
+
+    assert document_generator._download_image("https://cdn.test/widget.jpg") is None
+    assert list(tmp_path.iterdir()) == []
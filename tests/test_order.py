@@ -0,0 +1,44 @@
+import pytest
+
+from models.order import format_order_date
+
+
+@pytest.mark.parametrize(
+    "value, expected",
+    [
+        ("2024-01-15T14:30:00Z", "2024-01-15 14:30"),
+        ("2024-01-15T14:30:00.123Z", "2024-01-15 14:30"),
+        ("2024-01-15T14:30:00-05:00", "2024-01-15 14:30"),
+        ("2024-01-15T14:30:00", "2024-01-15 14:30"),
+        ("2024-01-15 14:30:00Z", "2024-01-15 14:30"),
+    ],
+)
+def test_format_order_date(value, expected):
+    """Test formatting of valid Shopify timestamps"""
+    assert format_order_date(value) == expected
+
+
+@pytest.mark.parametrize(
+    "value",
+    [
+        "2024-13-45T99:99:99Z",
+        "2024-02-30T10:30:00Z",
+        "15/01/2024 14:30",
+        "not-a-date",
+    ],
+)
+def test_format_order_date_malformed(value):
+    """Test that malformed timestamps, including fixed-shape ones, are rejected"""
+    assert format_order_date(value) == "Invalid Date"
+
+
+@pytest.mark.parametrize("value", [12345, ["2024-01-15T14:30:00Z"], {"a": 1}])
+def test_format_order_date_non_string(value):
+    """Test that non-string values, hashable or not, are rejected"""
+    assert format_order_date(value) == "Invalid Date"
+
+
+@pytest.mark.parametrize("value", ["", None])
+def test_format_order_date_missing(value):
+    """Test the placeholder for missing timestamps"""
+    assert format_order_date(value) == "No Date"
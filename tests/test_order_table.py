@@ -0,0 +1,91 @@
+import os
+
+import pytest
+from PySide6.QtCore import QItemSelectionModel, Qt
+from PySide6.QtWidgets import QApplication
+
+from gui.components.order_table import OrderTableWidget
+from models.order import OrderRow
+
+
+@pytest.fixture(scope="module")
+def qapp():
+    """Fixture providing a QApplication that needs no display"""
+    os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+    return QApplication.instance() or QApplication([])
+
+
+@pytest.fixture
+def table(qapp):
+    """Fixture to create an empty order table"""
+    widget = OrderTableWidget()
+    yield widget
+    widget.deleteLater()
+
+
+def order_row(name, date, customer):
+    """Order row with the fields the tests sort on"""
+    return OrderRow(
+        order_name=name,
+        date=date,
+        customer=customer,
+        location="Springfield, IL",
+        total="USD 10.00",
+        status="Unprinted",
+        id=f"gid://shopify/Order/{name.lstrip('#')}",
+    )
+
+
+ROWS = [
+    order_row("#1002", "2024-01-16 09:00", "Bea"),
+    order_row("#1001", "2024-01-17 12:00", "Cal"),
+    order_row("#1003", "2024-01-15 10:30", "Ada"),
+]
+
+
+def column(table, col):
+    """Values shown in one column, top to bottom"""
+    model = table.model()
+    return [model.index(row, col).data() for row in range(model.rowCount())]
+
+
+def test_load_orders_presorts_by_sort_indicator(table):
+    """Test loaded rows already follow the header's sort indicator"""
+    table.sortByColumn(OrderTableWidget.DATE_COL, Qt.DescendingOrder)
+
+    table.load_orders(ROWS)
+
+    assert table.rowCount() == 3
+    assert column(table, OrderTableWidget.DATE_COL) == [
+        "2024-01-17 12:00",
+        "2024-01-16 09:00",
+        "2024-01-15 10:30",
+    ]
+
+
+def test_sort_by_column(table):
+    """Test sorting a loaded table by each column's value"""
+    table.load_orders(ROWS)
+
+    table.sortByColumn(OrderTableWidget.CUSTOMER_COL, Qt.AscendingOrder)
+    assert column(table, OrderTableWidget.CUSTOMER_COL) == ["Ada", "Bea", "Cal"]
+
+    table.sortByColumn(OrderTableWidget.ORDER_COL, Qt.DescendingOrder)
+    assert column(table, OrderTableWidget.ORDER_COL) == ["#1003", "#1002", "#1001"]
+
+
+def test_get_selected_orders(table):
+    """Test selected rows map back to their order IDs, top to bottom"""
+    table.sortByColumn(OrderTableWidget.ORDER_COL, Qt.AscendingOrder)
+    table.load_orders(ROWS)
+
+    table.selectRow(2)
+    table.selectionModel().select(
+        table.model().index(0, 0),
+        QItemSelectionModel.Select | QItemSelectionModel.Rows,
+    )
+
+    assert table.get_selected_orders() == [
+        "gid://shopify/Order/1001",
+        "gid://shopify/Order/1003",
+    ]
@@ -0,0 +1,110 @@
+from datetime import datetime, timedelta
+from uuid import RFC_4122, UUID
+import time
+
+import pytest
+
+from models.print_job import PrintJob, PrintJobStatus
+
+
+def test_json_file_round_trip(tmp_path):
+    """Test that saved job metadata loads back unchanged"""
+    job = PrintJob.create(order_ids=["1", "2"], printer_name="Office", copies=2)
+    job.update_status(PrintJobStatus.FAILED, error="Paper jam")
+    job.output_path = tmp_path / "job.pdf"
+
+    path = tmp_path / "metadata.json"
+    job.to_json_file(path)
+
+    assert PrintJob.from_json_file(path).to_dict() == job.to_dict()
+
+
+def test_create_batch():
+    """Test that a batch gets distinct v4 IDs and one shared creation time"""
+    jobs = PrintJob.create_batch([["1"], ["2", "3"], ["4"]], printer_name="Office")
+
+    assert [job.order_ids for job in jobs] == [["1"], ["2", "3"], ["4"]]
+    assert len({job.id for job in jobs}) == 3
+    for job in jobs:
+        uuid = UUID(job.id)
+        assert uuid.version == 4
+        assert uuid.variant == RFC_4122
+        assert job.status == PrintJobStatus.PENDING
+        assert job.updated_at == job.created_at
+    assert len({job.created_at for job in jobs}) == 1
+
+
+def test_create_batch_empty():
+    """Test that an empty batch creates no jobs"""
+    assert PrintJob.create_batch([], printer_name="Office") == []
+
+
+@pytest.mark.parametrize(
+    "kwargs",
+    [
+        {"order_ids": [], "printer_name": "Office"},
+        {"order_ids": ["1"], "printer_name": ""},
+        {"order_ids": ["1"], "printer_name": "Office", "copies": 0},
+    ],
+)
+def test_create_validates(kwargs):
+    """Test that create still validates through __post_init__"""
+    with pytest.raises(ValueError):
+        PrintJob.create(**kwargs)
+
+
+def test_update_status_uses_given_time():
+    """Test that update_status records an injected timestamp"""
+    job = PrintJob.create(order_ids=["1"], printer_name="Office")
+    now = datetime(2024, 1, 15, 10, 30)
+
+    job.update_status(PrintJobStatus.PROCESSING, now=now)
+
+    assert job.updated_at == now
+    assert job.attempts == 1
+
+
+def test_update_status_defaults_to_current_time():
+    """Test that update_status reads the clock when no time is given"""
+    job = PrintJob.create(order_ids=["1"], printer_name="Office")
+    before = datetime.now()
+
+    job.update_status(PrintJobStatus.COMPLETED)
+
+    assert before <= job.updated_at <= datetime.now()
+
+
+def test_age_uses_monotonic_clock():
+    """Test that new jobs age by the monotonic clock, not created_at"""
+    job = PrintJob.create(order_ids=["1"], printer_name="Office")
+    # A wall-clock jump must not change the reported age
+    job.created_at -= timedelta(hours=1)
+    job._created_monotonic = time.monotonic() - 5
+
+    assert 5 <= job.age() < 60
+
+
+def test_age_of_loaded_job_uses_wall_clock():
+    """Test that jobs loaded from storage fall back to created_at"""
+    data = PrintJob.create(order_ids=["1"], printer_name="Office").to_dict()
+    data["created_at"] = (datetime.now() - timedelta(hours=1)).isoformat()
+
+    job = PrintJob.from_dict(data)
+
+    assert job._created_monotonic is None
+    assert 3600 <= job.age() < 3660
+
+
+def test_can_retry():
+    """Test that only failed or pending jobs with attempts left can retry"""
+    job = PrintJob.create(order_ids=["1"], printer_name="Office", max_attempts=1)
+    assert job.can_retry()
+
+    job.update_status(PrintJobStatus.PROCESSING)
+    assert not job.can_retry()
+
+    job.update_status(PrintJobStatus.FAILED)
+    assert not job.can_retry()  # The only attempt has been used
+
+    job.max_attempts = 2
+    assert job.can_retry()
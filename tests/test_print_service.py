@@ -0,0 +1,181 @@
+import pytest
+import array
+import io
+import mmap
+import os
+import tempfile
+import threading
+import time
+
+from services import print_service as print_service_module
+from services.print_service import PrintService
+from models.print_job import PrintJob, PrintJobStatus
+
+
+class FakePrinterInfo:
+    def __init__(self, name):
+        self._name = name
+
+    def printerName(self):
+        return self._name
+
+
+@pytest.fixture
+def print_service():
+    """Fixture to create a production-mode PrintService"""
+    service = PrintService(dev_mode=False)
+    yield service
+    service.shutdown()
+
+
+@pytest.fixture
+def printer_lookups(monkeypatch):
+    """Count calls made to the system printer enumeration"""
+    calls = []
+
+    def available_printers():
+        calls.append(1)
+        return [FakePrinterInfo("Office"), FakePrinterInfo("Warehouse")]
+
+    monkeypatch.setattr(
+        print_service_module.QPrinterInfo, "availablePrinters", available_printers
+    )
+    return calls
+
+
+def test_available_printers_are_cached(print_service, printer_lookups):
+    """Test that repeated printer lookups reuse the cached list"""
+    assert print_service.get_available_printers() == ["Office", "Warehouse"]
+    assert print_service.get_available_printers() == ["Office", "Warehouse"]
+    assert len(printer_lookups) == 1
+
+
+def test_invalidate_printer_cache(print_service, printer_lookups):
+    """Test that invalidating the cache forces a fresh lookup"""
+    print_service.get_available_printers()
+    print_service.invalidate_printer_cache()
+    print_service.get_available_printers()
+    assert len(printer_lookups) == 2
+
+
+def test_printer_cache_expires(print_service, printer_lookups, monkeypatch):
+    """Test that the cached printer list expires after the TTL"""
+    print_service.get_available_printers()
+    monkeypatch.setattr(print_service_module, "PRINTER_CACHE_TTL", 0)
+    print_service.get_available_printers()
+    assert len(printer_lookups) == 2
+
+
+def test_shutdown_wakes_idle_worker():
+    """Test that shutdown does not wait for a polling timeout"""
+    service = PrintService(dev_mode=False)
+    start = time.monotonic()
+    service.shutdown()
+    assert not service.print_thread.is_alive()
+    assert time.monotonic() - start < 0.5
+
+
+def test_default_printer_is_cached(print_service, monkeypatch):
+    """Test that the default printer lookup is cached until invalidated"""
+    calls = []
+
+    def default_printer():
+        calls.append(1)
+        return FakePrinterInfo("Office")
+
+    monkeypatch.setattr(
+        print_service_module.QPrinterInfo, "defaultPrinter", default_printer
+    )
+    assert print_service.get_default_printer() == "Office"
+    assert print_service.get_default_printer() == "Office"
+    assert len(calls) == 1
+
+    print_service.invalidate_printer_cache()
+    print_service.get_default_printer()
+    assert len(calls) == 2
+
+
+@pytest.mark.parametrize(
+    "source", ["bytes", "memoryview", "array", "mmap", "file", "buffer"]
+)
+def test_save_pdf(tmp_path, source):
+    """Test saving PDF content given as a buffer or a binary file object"""
+    content = b"%PDF-1.7 " + os.urandom(64 * 1024)
+    if source == "bytes":
+        pdf = content
+    elif source == "memoryview":
+        pdf = memoryview(bytearray(content))
+    elif source == "array":
+        pdf = array.array("B", content)
+    elif source == "mmap":
+        pdf = mmap.mmap(-1, len(content))
+        pdf.write(content)
+    elif source == "file":
+        pdf = tempfile.TemporaryFile()
+        pdf.write(content)
+        pdf.seek(0)
+    else:
+        pdf = io.BytesIO(content)
+
+    output_path = tmp_path / "job.pdf"
+    print_service_module._save_pdf(pdf, output_path)
+    assert output_path.read_bytes() == content
+
+
+def test_wait_for_job(print_service):
+    """Test waiting on a submitted job until it completes"""
+    job = PrintJob.create(["gid://shopify/Order/1"], "Office")
+    job_id = print_service.submit_print_job(job, b"%PDF-1.7")
+
+    assert print_service.wait_for_job(job_id, timeout=5.0) == PrintJobStatus.COMPLETED
+    assert print_service.get_job_status(job_id) == PrintJobStatus.COMPLETED
+    assert job.pdf_content is None  # Released once printed
+    assert print_service.wait_for_job("unknown") is None
+
+
+def test_job_dequeued_after_shutdown_is_cancelled(print_service):
+    """Test that a job the worker drops at shutdown releases its waiters"""
+    print_service.stop_event.set()
+    job = PrintJob.create(["gid://shopify/Order/1"], "Office")
+    job_id = print_service.submit_print_job(job, b"%PDF-1.7")
+
+    assert print_service.wait_for_job(job_id, timeout=5.0) == PrintJobStatus.CANCELLED
+    assert job.pdf_content is None
+
+
+def test_shutdown_cancels_job_being_printed(tmp_path):
+    """Test that shutdown interrupting a dev-mode print cancels the job"""
+    service = PrintService(dev_mode=True)
+    service.output_dir = tmp_path
+    started = threading.Event()
+    completions = []
+
+    job = PrintJob.create(["gid://shopify/Order/1"], "Development Printer")
+    job_id = service.submit_print_job(
+        job,
+        b"%PDF-1.7",
+        on_progress=lambda current, total: started.set(),
+        on_complete=lambda success, error: completions.append((success, error)),
+    )
+    assert started.wait(5.0)
+    service.shutdown()
+
+    assert service.wait_for_job(job_id, timeout=5.0) == PrintJobStatus.CANCELLED
+    assert completions == [(False, "Print job cancelled")]
+
+
+def test_finished_jobs_are_bounded(print_service, monkeypatch):
+    """Test that only the most recent finished jobs are kept"""
+    monkeypatch.setattr(print_service_module, "MAX_FINISHED_JOBS", 2)
+    job_ids = [
+        print_service.submit_print_job(
+            PrintJob.create([f"gid://shopify/Order/{i}"], "Office"), b"%PDF-1.7"
+        )
+        for i in range(3)
+    ]
+    for job_id in job_ids:
+        print_service.wait_for_job(job_id, timeout=5.0)
+    print_service.job_queue.join()
+
+    assert print_service.get_job_status(job_ids[0]) is None
+    assert print_service.get_job_status(job_ids[2]) == PrintJobStatus.COMPLETED
@@ -1,42 +1,138 @@
 # src/tests/test_shopify_client.py
-import sys
-import os
-
-sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "../src")))
-from services.shopify_client import create_client
+import pytest
 import json
+import shopify
+from services import shopify_client as shopify_client_module
+from services.shopify_client import ShopifyClient, ShopifyError
+
+
+class FakeResponse:
+    def __init__(self, payload):
+        self.content = json.dumps(payload).encode()
+
+    def raise_for_status(self):
+        pass
+
+
+class FakeTransport:
+    """Stands in for the client's HTTP session, replaying canned responses"""
+
+    def __init__(self):
+        self.requests = []
+        self.handler = lambda query, variables: {"data": {}}
+
+    def post(self, url, json=None, timeout=None):
+        self.requests.append(json)
+        return FakeResponse(self.handler(json["query"], json["variables"]))
+
+
+@pytest.fixture
+def transport():
+    """Fixture providing a fake transport that records each GraphQL request"""
+    return FakeTransport()
+
+
+@pytest.fixture
+def client(monkeypatch, transport):
+    """Fixture to create a ShopifyClient whose requests never leave the process"""
+    monkeypatch.setattr(shopify_client_module, "API_VERSION", "2024-10")
+    # Keep the session this client sets up out of the module-wide cache
+    monkeypatch.setattr(shopify_client_module, "_SESSION_CACHE", {})
+    client = ShopifyClient("test-shop.myshopify.com", "test-token")
+    client.close()
+    monkeypatch.setattr(client, "_http", transport)
+    yield client
+    shopify.ShopifyResource.clear_session()
+
+
+def order_node(i):
+    """Minimal GetManyOrders order node"""
+    return {
+        "id": f"gid://shopify/Order/{i}",
+        "name": f"#{1000 + i}",
+        "createdAt": "2024-01-15T10:30:00Z",
+        "totalPriceSet": {"shopMoney": {"amount": "10.00", "currencyCode": "USD"}},
+        "shippingAddress": {"city": "Springfield", "province": "IL", "name": "Jo"},
+    }
+
+
+def test_get_unprinted_order_rows(client, transport):
+    """Test unprinted orders are queried and normalized into rows"""
+    transport.handler = lambda query, variables: {
+        "data": {"orders": {"edges": [{"node": order_node(1)}]}}
+    }
+
+    rows = client.get_unprinted_order_rows(limit=5)
+
+    variables = transport.requests[0]["variables"]
+    assert variables == {"first": 5, "query": "tag_not:printed AND status:open"}
+    assert [row.order_name for row in rows] == ["#1001"]
+    assert rows[0].date == "2024-01-15 10:30"
+    assert rows[0].location == "Springfield, IL"
+
+
+def test_graphql_errors_raise(client, transport):
+    """Test a GraphQL error response raises ShopifyError"""
+    transport.handler = lambda query, variables: {"errors": [{"message": "Throttled"}]}
+
+    with pytest.raises(ShopifyError, match="Throttled"):
+        client.get_order_details("gid://shopify/Order/1")
+
+
+def test_get_orders_details_batches(client, transport):
+    """Test large detail fetches are split into batches but keep their order"""
+    transport.handler = lambda query, variables: {
+        "data": {"nodes": [{"id": order_id} for order_id in variables["ids"]]}
+    }
+    order_ids = [f"gid://shopify/Order/{i}" for i in range(25)]
+
+    result = client.get_orders_details(order_ids)
+
+    assert [node["id"] for node in result["data"]["nodes"]] == order_ids
+    batch_sizes = sorted(len(r["variables"]["ids"]) for r in transport.requests)
+    assert batch_sizes == [5, 10, 10]
+
+
+def test_get_orders_details_errors_raise(client, transport):
+    """Test a batch answered with a GraphQL error raises ShopifyError"""
+    transport.handler = lambda query, variables: {"errors": [{"message": "Throttled"}]}
+    order_ids = [f"gid://shopify/Order/{i}" for i in range(3)]
+
+    with pytest.raises(ShopifyError, match="Throttled"):
+        client.get_orders_details(order_ids)
+    assert len(transport.requests) == 1
 
 
-def print_json(data):
-    """Print JSON data in a readable format"""
-    print(json.dumps(data, indent=2))
+def test_get_orders_details_splits_costly_batch(client, transport):
+    """Test a batch over the query cost limit is split until it fits"""
 
+    def handler(query, variables):
+        if len(variables["ids"]) > 3:
+            return {
+                "errors": [
+                    {
+                        "message": "Query cost exceeds the single query max cost",
+                        "extensions": {"code": "MAX_COST_EXCEEDED"},
+                    }
+                ]
+            }
+        nodes = [{"id": order_id} for order_id in variables["ids"]]
+        return {"data": {"nodes": nodes}}
 
-def test_shopify_client():
-    try:
-        # Create client
-        print("Creating Shopify client...")
-        client = create_client()
+    transport.handler = handler
+    order_ids = [f"gid://shopify/Order/{i}" for i in range(10)]
 
-        # Test getting unprinted orders
-        print("\nFetching unprinted orders...")
-        orders_result = client.get_unprinted_orders(limit=5)  # Limit to 5 for testing
-        print("\nUnprinted Orders Result:")
-        print_json(orders_result)
+    result = client.get_orders_details(order_ids)
 
-        # If we got orders, test getting details for the first one
-        if orders_result.get("data", {}).get("orders", {}).get("edges"):
-            first_order_id = orders_result["data"]["orders"]["edges"][0]["node"]["id"]
-            print(f"\nFetching details for order {first_order_id}...")
-            order_details = client.get_order_details(first_order_id)
-            print("\nOrder Details Result:")
-            print_json(order_details)
-        else:
-            print("\nNo unprinted orders found to test order details.")
+    assert [node["id"] for node in result["data"]["nodes"]] == order_ids
+    batch_sizes = [len(r["variables"]["ids"]) for r in transport.requests]
+    assert batch_sizes == [10, 5, 2, 3, 5, 2, 3]
 
-    except Exception as e:
-        print(f"\nError during testing: {str(e)}")
 
+def test_single_order_over_cost_limit_raises(client, transport):
+    """Test a single order over the cost limit is reported, not retried"""
+    error = {"message": "Too costly", "extensions": {"code": "MAX_COST_EXCEEDED"}}
+    transport.handler = lambda query, variables: {"errors": [error]}
 
-if __name__ == "__main__":
-    test_shopify_client()
+    with pytest.raises(ShopifyError, match="Too costly"):
+        client.get_orders_details(["gid://shopify/Order/1"])